@@ -1,13 +1,22 @@
+import importlib
 from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
-from src.routes.content_routes import content_bp
-from src.routes.history_routes import history_bp
-from src.routes.medical_routes import medical_bp
-from src.config import logger, HOST, DEBUG
+from src.config import logger, HOST, PORT, DEBUG, ENABLED_BLUEPRINTS
 
 load_dotenv()
 
+# name -> (module, blueprint attribute); a module is imported only when its
+# blueprint is enabled in ENABLED_BLUEPRINTS
+BLUEPRINTS = {
+    "content": ("src.routes.content_routes", "content_bp"),
+    "history": ("src.routes.history_routes", "history_bp"),
+    "medical": ("src.routes.medical_routes", "medical_bp"),
+    "ingestion": ("src.routes.ingestion_routes", "ingestion_bp"),
+    # Also times every request and adds a Server-Timing header
+    "metrics": ("src.routes.metrics_routes", "metrics_bp"),
+}
+
 def create_app():
     app = Flask(__name__)
 
@@ -16,14 +25,27 @@ def create_app():
         origins=["*"]     
     )
 
-    app.register_blueprint(content_bp, url_prefix="/api")
-    app.register_blueprint(history_bp, url_prefix="/api")
-    app.register_blueprint(medical_bp, url_prefix="/api")
+    unknown = [name for name in ENABLED_BLUEPRINTS if name not in BLUEPRINTS]
+    if unknown:
+        raise ValueError(f"Unknown blueprints in ENABLED_BLUEPRINTS: {', '.join(unknown)}")
+    for name in ENABLED_BLUEPRINTS:
+        module_name, attribute = BLUEPRINTS[name]
+        app.register_blueprint(getattr(importlib.import_module(module_name), attribute), url_prefix="/api")
+
+    if "medical" in ENABLED_BLUEPRINTS:
+        # Load the SVC model and recommendation tables once, before the first request
+        from src.services.model_registry import warm_up_registry
+        warm_up_registry()
 
-    logger.info("Starting LLM Flask application")
+    logger.info(f"Starting LLM Flask application with blueprints: {', '.join(ENABLED_BLUEPRINTS)}")
     return app
 
 
-if __name__ == "__main__":
+def main():
+    """Development server; use gunicorn (see gunicorn.conf.py) in production."""
     app = create_app()
-    app.run(debug=DEBUG, host=HOST)
+    app.run(debug=DEBUG, host=HOST, port=PORT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""ASGI entry point: async LLM-bound routes, everything else through Flask.
+
+Routes in ASYNC_ROUTES run natively on the event loop, so hundreds of chats
+can wait on the LLM at once in one process. All other paths are passed to
+the Flask app through asgiref's WsgiToAsgi, which runs them on its thread
+pool exactly as under a WSGI server.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+import json
+import time
+from asgiref.wsgi import WsgiToAsgi
+from app import create_app
+from src.config import ENABLED_BLUEPRINTS
+from src.utils.metrics import observe, record_error, start_trace, finish_trace, server_timing
+
+flask_app = create_app()
+wsgi_app = WsgiToAsgi(flask_app)
+
+if "content" in ENABLED_BLUEPRINTS:
+    from src.routes.async_content_routes import ASYNC_ROUTES
+else:
+    ASYNC_ROUTES = {}
+
+
+async def _read_json(receive) -> dict:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        data = None
+    return data if isinstance(data, dict) else {}
+
+
+async def _send_json(send, payload, status: int, stages: dict):
+    body = json.dumps(payload).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        # Same policy as CORS(app, origins=["*"]) on the Flask side
+        (b"access-control-allow-origin", b"*"),
+    ]
+    if stages:
+        headers.append((b"server-timing", server_timing(stages).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if ASYNC_ROUTES:
+                    from src.services.redis_pool import close_async_redis_client
+                    await close_async_redis_client()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    handler = ASYNC_ROUTES.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+    if handler is None:
+        await wsgi_app(scope, receive, send)
+        return
+    # Same request timing as the metrics blueprint applies to Flask routes
+    stage = f"request.async.{handler.__name__}"
+    token = start_trace()
+    start = time.perf_counter()
+    payload, status = await handler(await _read_json(receive))
+    stages = finish_trace(token)
+    observe(stage, time.perf_counter() - start)
+    if status >= 500:
+        record_error(stage)
+    await _send_json(send, payload, status, stages)
@@ -0,0 +1,80 @@
+"""LLM calls and latency for repeated questions, answer cache off vs on.
+
+Twenty users ask the same three questions about one uploaded leaflet. The
+chat model is a fake that counts its calls and sleeps LLM_DELAY seconds per
+call; embeddings are deterministic fakes and Redis is fakeredis. No question
+has chat history, so each is its own standalone question.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_answer_cache
+"""
+import logging
+import tempfile
+import time
+
+import fakeredis
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.services import answer_cache, embedding_cache, llm_processor, redis_pool, vector_store
+
+LLM_DELAY = 0.05
+USERS = 20
+QUESTIONS = ["What are the side effects?", "how should it be stored", "Can children take it?"]
+LEAFLET = "Leaflet: side effects include nausea. Store below 25C. Not for children under 12."
+
+
+class CountingChatModel(GenericFakeChatModel):
+    calls: int = 0
+
+    def _generate(self, *args, **kwargs):
+        CountingChatModel.calls += 1
+        time.sleep(LLM_DELAY)
+        return super()._generate(*args, **kwargs)
+
+
+def answers():
+    while True:
+        yield AIMessage(content="Common side effects are mild nausea.")
+
+
+def run(client, cache):
+    answer_cache.ANSWER_CACHE_BACKEND = cache.backend if cache else "off"
+    answer_cache.set_answer_cache(cache)
+    CountingChatModel.calls = 0
+    start = time.perf_counter()
+    for user in range(USERS):
+        for n, question in enumerate(QUESTIONS):
+            # A fresh username per question keeps it free of chat history
+            response = client.post("/api/process-content", json={
+                "username": f"user{user}-{n}-{cache.backend if cache else 'off'}",
+                "question": question,
+                "source": LEAFLET,
+                "source_type": "raw",
+            })
+            assert response.status_code == 200, response.json
+    return CountingChatModel.calls, time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    redis_pool.set_redis_client(fakeredis.FakeRedis())
+    llm_processor.set_embeddings(DeterministicFakeEmbedding(size=64))
+    llm_processor.set_chat_model(CountingChatModel(messages=answers()))
+    embedding_cache.set_cached_embeddings(embedding_cache.CachedEmbeddings(None, "fake", ":memory:", 10_000))
+    vector_store.vector_store_manager.base_dir = tempfile.mkdtemp()
+
+    from app import create_app
+    client = create_app().test_client()
+    requests = USERS * len(QUESTIONS)
+    print(f"{requests} requests, {LLM_DELAY * 1e3:.0f} ms per LLM call")
+    for label, cache in (("off", None), ("local", answer_cache.LocalAnswerCache()),
+                         ("redis", answer_cache.RedisAnswerCache(fakeredis.FakeRedis()))):
+        calls, seconds = run(client, cache)
+        print(f"cache {label:>5}: {calls:>3} LLM calls  {seconds / requests * 1e3:7.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Offline throughput and latency of the main API endpoints, compared with a baseline.
+
+Gemini chat, embeddings and Redis are replaced by the fakes in
+benchmarks/fakes.py (--chat-latency / --embedding-latency per call), so results
+are reproducible without network access. Each mode runs in a fresh
+interpreter with its own fake Redis and temp directories:
+
+- client: create_app() driven through the Flask test client, one per thread
+- server: the same app behind a threaded werkzeug server on 127.0.0.1,
+  called over HTTP with one requests.Session per client thread
+
+Scenarios run in order, each with --requests requests from --threads
+threads. They cycle through USERS users, so indexing happens once per user
+and later requests reuse it. Results are compared with api_baseline.json
+next to this file. The script exits non-zero if throughput drops, or median
+latency rises, by more than TOLERANCE. p95/p99 are reported but not gated:
+with several client threads on few CPUs they mostly measure scheduling.
+After an intended change, re-record with --update.
+
+Needs requirements-dev.txt (fakeredis). Run from llm_flask_app/:
+
+    python -m benchmarks.bench_api [--mode client|server|both] [--update]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_baseline.json")
+TOLERANCE = 0.30
+# Median changes smaller than this are noise for sub-millisecond endpoints
+P50_SLACK_MS = 5.0
+USERS = 16
+LEAFLET = "\n\n".join([
+    "Paracetamol relieves mild to moderate pain and reduces fever. Adults may take 500 mg to 1 g "
+    "every four to six hours, with no more than 4 g in 24 hours.",
+    "Side effects are rare but include skin rash and, after overdose, serious liver damage. "
+    "Do not combine with other products that contain paracetamol.",
+    "Ibuprofen is an anti-inflammatory painkiller. Take it with food to reduce stomach upset. "
+    "Avoid it in late pregnancy and if you have a history of stomach ulcers.",
+    "Store all medicines below 25C, out of the sight and reach of children.",
+])
+QUESTIONS = [
+    "What is the maximum daily dose of paracetamol?",
+    "What are the side effects of paracetamol?",
+    "Should ibuprofen be taken with food?",
+    "Who should avoid ibuprofen?",
+    "How should these medicines be stored?",
+]
+SYMPTOM_TEXTS = [
+    "I have itching, skin rash and nodal skin eruptions",
+    "high fever with chills, headache and muscle pain for three days",
+    "stomach pain, acidity and vomiting after meals",
+    "continuous sneezing, shivering and watering from eyes",
+    "joint pain, fatigue and weight loss with mild fever",
+]
+
+
+def _user(i: int) -> str:
+    return f"bench{i % USERS}"
+
+
+# name -> request spec for the i-th request; run in this order
+SCENARIOS = {
+    "predict-medicine": lambda i: {
+        "method": "POST", "path": "/api/predict-medicine",
+        "json": {"text": SYMPTOM_TEXTS[i % len(SYMPTOM_TEXTS)]},
+    },
+    "process-content": lambda i: {
+        "method": "POST", "path": "/api/process-content",
+        "json": {"username": _user(i), "question": QUESTIONS[i % len(QUESTIONS)],
+                 "source": LEAFLET, "source_type": "raw"},
+    },
+    "process-file-content": lambda i: {
+        "method": "POST", "path": "/api/process-file-content",
+        "form": {"username": _user(i), "question": QUESTIONS[i % len(QUESTIONS)], "source_type": "text"},
+        "file": (f"leaflet_{_user(i)}.txt", LEAFLET.encode("utf-8")),
+    },
+    "conversation-history": lambda i: {"method": "GET", "path": f"/api/conversation-history/{_user(i)}"},
+    "clear-history-text": lambda i: {"method": "DELETE", "path": f"/api/clear-history-text/{_user(i)}"},
+}
+
+
+class TestClientDriver:
+    def __init__(self, app):
+        self.app = app
+        # FlaskClient keeps a cookie jar and is not thread-safe
+        self.local = threading.local()
+
+    def send(self, spec: dict) -> int:
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        kwargs = {}
+        if "json" in spec:
+            kwargs["json"] = spec["json"]
+        if "file" in spec:
+            name, content = spec["file"]
+            kwargs["data"] = {**spec["form"], "file": (io.BytesIO(content), name)}
+            kwargs["content_type"] = "multipart/form-data"
+        return client.open(spec["path"], method=spec["method"], **kwargs).status_code
+
+    def close(self):
+        pass
+
+
+class ServerDriver:
+    def __init__(self, app):
+        import requests
+        from werkzeug.serving import make_server
+        self._requests = requests
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.local = threading.local()
+
+    def send(self, spec: dict) -> int:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = self._requests.Session()
+        kwargs = {}
+        if "json" in spec:
+            kwargs["json"] = spec["json"]
+        if "file" in spec:
+            kwargs["data"] = spec["form"]
+            kwargs["files"] = {"file": spec["file"]}
+        return session.request(spec["method"], self.base_url + spec["path"], timeout=60, **kwargs).status_code
+
+    def close(self):
+        self.server.shutdown()
+
+
+def run_scenario(driver, build, requests: int, threads: int) -> dict:
+    latencies, errors = [], []
+
+    def one(i):
+        spec = build(i)
+        start = time.perf_counter()
+        status = driver.send(spec)
+        latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            errors.append(status)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pct(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3, 2)
+
+    return {"rps": round(requests / elapsed, 1), "p50_ms": pct(0.50), "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99), "errors": len(errors)}
+
+
+def worker(args):
+    """Run every scenario in this process for one mode and print the results as JSON."""
+    from benchmarks.fakes import install_fakes
+    install_fakes(chat_latency=args.chat_latency, embedding_latency=args.embedding_latency)
+    from app import create_app
+    logging.getLogger().setLevel(logging.WARNING)
+    app = create_app()
+    driver = ServerDriver(app) if args.worker == "server" else TestClientDriver(app)
+    try:
+        results = {
+            name: run_scenario(driver, build, args.requests, args.threads)
+            for name, build in SCENARIOS.items()
+        }
+    finally:
+        driver.close()
+    print(json.dumps(results))
+
+
+def compare(current: dict, baseline: dict) -> tuple:
+    """Returns (note, regressed) for one scenario."""
+    if not baseline:
+        return "", False
+    rps_ratio = current["rps"] / baseline["rps"] if baseline["rps"] else 1.0
+    p50_delta = current["p50_ms"] - baseline["p50_ms"]
+    regressed = rps_ratio < 1 - TOLERANCE or (
+        p50_delta > P50_SLACK_MS and current["p50_ms"] > baseline["p50_ms"] * (1 + TOLERANCE)
+    )
+    note = f"  ({rps_ratio:.0%} of baseline {baseline['rps']} req/s, p50 {p50_delta:+.1f} ms)"
+    return note + ("  REGRESSION" if regressed else ""), regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["client", "server", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent client threads")
+    parser.add_argument("--chat-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--embedding-latency", type=float, default=0.005, help="seconds per fake embedding call")
+    parser.add_argument("--update", action="store_true", help="record the results as the new baseline")
+    parser.add_argument("--worker", choices=["client", "server"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args)
+        return
+
+    settings = {"requests": args.requests, "threads": args.threads,
+                "chat_latency": args.chat_latency, "embedding_latency": args.embedding_latency}
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            stored = json.load(f)
+        if stored.get("settings") == settings:
+            baseline = stored["results"]
+        elif not args.update:
+            print(f"Baseline was recorded with {stored.get('settings')}; not comparing")
+
+    modes = ["client", "server"] if args.mode == "both" else [args.mode]
+    results, failed = {}, False
+    print(f"{args.requests} requests per scenario, {args.threads} threads, "
+          f"fake LLM {args.chat_latency * 1e3:.0f} ms, fake embeddings {args.embedding_latency * 1e3:.0f} ms")
+    for mode in modes:
+        command = [sys.executable, "-m", "benchmarks.bench_api", "--worker", mode,
+                   "--requests", str(args.requests), "--threads", str(args.threads),
+                   "--chat-latency", str(args.chat_latency), "--embedding-latency", str(args.embedding_latency)]
+        output = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if output.returncode != 0:
+            # The worker's logs are noise on success but hold the traceback on failure
+            sys.stderr.write(output.stderr)
+            sys.exit(f"{mode} worker failed with exit code {output.returncode}")
+        for name, result in json.loads(output.stdout.strip().splitlines()[-1]).items():
+            key = f"{mode}/{name}"
+            results[key] = result
+            note, regressed = ("", False) if args.update else compare(result, baseline.get(key))
+            failed = failed or regressed or result["errors"] > 0
+            print(f"{key:>29}: {result['rps']:7.1f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+                  f"p95 {result['p95_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+                  f"errors {result['errors']}{note}")
+
+    if args.update:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"settings": settings, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Concurrent /api/process-content: sync Flask worker threads vs the ASGI route.
+
+Every request waits LLM_DELAY on a fake chat model (time.sleep for invoke,
+asyncio.sleep for ainvoke), so the numbers show how many chats one process
+keeps in flight, not model speed. Embeddings are deterministic fakes; Redis
+is fakeredis with the sync and async clients sharing one server.
+
+- sync: the Flask view driven by THREADS threads, like a gthread worker
+- asgi: asgi.app called CONCURRENCY times at once on a single event loop
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_async_content
+"""
+import asyncio
+import json
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import fakeredis.aioredis
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.services import answer_cache, embedding_cache, llm_processor, redis_pool, vector_store
+
+LLM_DELAY = 0.2
+CONCURRENCY = 200
+THREADS = 16
+LEAFLET = "Leaflet: side effects include nausea and headache. Store below 25C."
+
+
+_calls = {"in_flight": 0, "peak": 0}
+_calls_lock = threading.Lock()
+
+
+def _track(delta):
+    with _calls_lock:
+        _calls["in_flight"] += delta
+        _calls["peak"] = max(_calls["peak"], _calls["in_flight"])
+
+
+class SlowChatModel(GenericFakeChatModel):
+    def _generate(self, *args, **kwargs):
+        _track(1)
+        time.sleep(LLM_DELAY)
+        _track(-1)
+        return super()._generate(*args, **kwargs)
+
+    async def _agenerate(self, *args, **kwargs):
+        _track(1)
+        await asyncio.sleep(LLM_DELAY)
+        _track(-1)
+        return super()._generate(*args, **kwargs)
+
+
+def answers():
+    while True:
+        yield AIMessage(content="Nausea and headache are the common side effects.")
+
+
+def setup():
+    server = fakeredis.FakeServer()
+    redis_pool.set_redis_client(fakeredis.FakeRedis(server=server))
+    redis_pool.set_async_redis_client_factory(lambda: fakeredis.aioredis.FakeRedis(server=server))
+    llm_processor.set_embeddings(DeterministicFakeEmbedding(size=64))
+    llm_processor.set_chat_model(SlowChatModel(messages=answers()))
+    embedding_cache.set_cached_embeddings(embedding_cache.CachedEmbeddings(None, "fake", ":memory:", 10_000))
+    vector_store.vector_store_manager.base_dir = tempfile.mkdtemp()
+    # Every request must reach the model
+    answer_cache.ANSWER_CACHE_BACKEND = "off"
+    answer_cache.set_answer_cache(None)
+
+
+def body(i):
+    return {"username": f"user{i}", "question": f"What are the side effects? ({i})",
+            "source": LEAFLET, "source_type": "raw"}
+
+
+def run_sync(flask_app):
+    client = flask_app.test_client()
+
+    def send(i):
+        response = client.post("/api/process-content", json=body(i))
+        assert response.status_code == 200, response.json
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(send, range(CONCURRENCY)))
+    return time.perf_counter() - start
+
+
+async def call_asgi(app, payload):
+    raw = json.dumps(payload).encode()
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": raw, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/api/process-content", "headers": [],
+             "query_string": b"", "http_version": "1.1", "scheme": "http", "server": ("bench", 80)}
+    await app(scope, receive, send)
+    assert sent[0]["status"] == 200, sent[1]["body"][:300]
+
+
+def run_asgi(app):
+    async def main():
+        await asyncio.gather(*(call_asgi(app, body(i)) for i in range(CONCURRENCY)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    setup()
+    import asgi
+
+    results = {}
+    for label, run in (("sync", lambda: run_sync(asgi.flask_app)), ("asgi", lambda: run_asgi(asgi.app))):
+        _calls["peak"] = 0
+        results[label] = (run(), _calls["peak"])
+
+    print(f"{CONCURRENCY} concurrent requests, {LLM_DELAY * 1e3:.0f} ms per LLM call")
+    for label, (seconds, peak) in results.items():
+        print(f"{label:>4}: {seconds:6.2f}s  {CONCURRENCY / seconds:7.1f} req/s  peak in-flight LLM calls {peak}")
+
+
+if __name__ == "__main__":
+    main()
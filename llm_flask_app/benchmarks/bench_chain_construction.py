@@ -0,0 +1,86 @@
+"""Per-request cost of building the conversational chain, before and after.
+
+"before" re-creates the chat model, both prompts and every sub-chain per
+request, the way the routes originally did; "after" fetches the process-wide
+standalone-question and QA chains that qa_pipeline runs today. No network
+calls are made: the Gemini client is constructed but never invoked.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_chain_construction [--iterations 500]
+"""
+import argparse
+import logging
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder-key")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_community.vectorstores import FAISS
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain.chains import create_history_aware_retriever, create_retrieval_chain
+from langchain.chains.combine_documents import create_stuff_documents_chain
+
+from src.services import llm_processor
+
+
+def build_chain_before(retriever):
+    model = ChatGoogleGenerativeAI(
+        model="gemini-1.5-flash", temperature=0.3, google_api_key=os.environ["GOOGLE_API_KEY"]
+    )
+    contextualize_q_prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", llm_processor.contextualize_q_system_prompt),
+            MessagesPlaceholder("chat_history"),
+            ("human", "{input}"),
+        ]
+    )
+    history_aware_retriever = create_history_aware_retriever(model, retriever, contextualize_q_prompt)
+    qa_prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", llm_processor.qa_system_prompt),
+            MessagesPlaceholder("chat_history"),
+            ("human", "{input}"),
+        ]
+    )
+    question_answer_chain = create_stuff_documents_chain(model, qa_prompt)
+    return create_retrieval_chain(history_aware_retriever, question_answer_chain)
+
+
+def get_chains_after(retriever):
+    # The retriever is queried directly by qa_pipeline; no per-request chain binds it
+    return llm_processor.get_standalone_question_chain(), llm_processor.get_question_answer_chain()
+
+
+def timeit(fn, retriever, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(retriever)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    llm_processor.GOOGLE_API_KEY = os.environ["GOOGLE_API_KEY"]
+    store = FAISS.from_texts(["benchmark chunk"], DeterministicFakeEmbedding(size=32))
+    retriever = store.as_retriever(search_kwargs={"k": 4})
+
+    # Warm both paths once so import-time work is not counted
+    build_chain_before(retriever)
+    get_chains_after(retriever)
+
+    before = timeit(build_chain_before, retriever, args.iterations)
+    after = timeit(get_chains_after, retriever, args.iterations)
+    print(f"before: {before * 1e3:.3f} ms/request")
+    print(f"after:  {after * 1e3:.3f} ms/request")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
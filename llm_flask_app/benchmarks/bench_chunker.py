@@ -0,0 +1,86 @@
+"""Chunking a large text file: list-based get_text_chunks vs lazy iter_text_chunks.
+
+"list" is the previous pipeline: TextLoader().load() the whole file, build a
+splitter, split_documents() into a list and copy the texts into a second
+list. "lazy" streams the file in TEXT_BLOCK_CHARS blocks through
+iter_text_chunks and iter_chunk_batches, the way ingestion consumes it.
+Each mode runs in its own subprocess so peak RSS is measured cleanly.
+
+Run from llm_flask_app/ (size in MB, default 100):
+
+    python -m benchmarks.bench_chunker [MB]
+"""
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PARAGRAPH = ("The patient reported fever, cough and fatigue for three days. " * 12).strip()
+
+
+def write_text(path, megabytes):
+    paragraph = (PARAGRAPH + "\n\n").encode("utf-8")
+    with open(path, "wb") as f:
+        for _ in range(megabytes * 2**20 // len(paragraph)):
+            f.write(paragraph)
+
+
+def run_list(path):
+    from langchain_community.document_loaders import TextLoader
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    documents = TextLoader(path).load()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=1000)
+    chunks = splitter.split_documents(documents)
+    texts = [chunk.page_content for chunk in chunks]
+    return len(texts), sum(map(len, texts))
+
+
+def run_lazy(path):
+    from src.services.content_loader import lazy_load_content, iter_text_chunks, iter_chunk_batches
+
+    count = chars = 0
+    chunks = iter_text_chunks(lazy_load_content(path, "text"), "text")
+    for batch in iter_chunk_batches(chunks):
+        count += len(batch)
+        chars += sum(len(chunk.page_content) for chunk in batch)
+    return count, chars
+
+
+def child(mode, path):
+    logging.getLogger().setLevel(logging.WARNING)
+    start = time.perf_counter()
+    count, chars = (run_list if mode == "list" else run_lazy)(path)
+    seconds = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"chunks": count, "chars": chars, "seconds": seconds, "peak_mib": peak_kib / 1024}))
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.txt")
+        write_text(path, megabytes)
+        results = {}
+        for mode in ("list", "lazy"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_chunker", "--child", mode, path],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results[mode] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"{megabytes} MB text file")
+    for mode, r in results.items():
+        print(f"{mode:>5}: {r['chunks']:>6} chunks  {r['seconds']:6.2f}s  "
+              f"{megabytes / r['seconds']:6.1f} MB/s  peak RSS {r['peak_mib']:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
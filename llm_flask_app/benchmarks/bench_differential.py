@@ -0,0 +1,87 @@
+"""Top-k differential diagnosis: DiseaseRanker vs sklearn's decision_function and re-querying.
+
+For symptom sets taken from Training.csv rows (a random subset of each
+row's symptoms, as patients rarely report all of them), compares:
+
+- predict: one label per call, today's /api/predict-medicine
+- requery: a client exploring alternatives by re-sending the set with one
+  symptom left out each time (one predict per variation)
+- sklearn: svc.decision_function ("ovr") plus argsort, the textbook top-k
+- ranker: DiseaseRanker.rank, one libsvm call plus one matrix product
+
+Both for a single patient and for a batch of BATCH. Also checks that the
+ranker's first disease is the predict label for every set.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_differential
+"""
+import logging
+import os
+import timeit
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.services.model_registry import get_knowledge_base
+from src.services.recommedmedicine import TRAINING_DATA_DIR, get_predicted_values
+from src.utils.symptom_vocabulary import symptom_vocabulary
+
+TOP_K = 5
+BATCH = 1000
+SETS = 2000
+
+
+def symptom_sets(seed=11):
+    training = pd.read_csv(os.path.join(TRAINING_DATA_DIR, "Training.csv"))
+    columns = np.array([c for c in training.columns if c != "prognosis"])
+    rng = np.random.default_rng(seed)
+    sets = []
+    for row in training.drop(columns="prognosis").values[rng.permutation(len(training))[:SETS]]:
+        present = columns[row == 1]
+        keep = rng.choice(len(present), max(1, len(present) // 2), replace=False)
+        sets.append(list(present[keep]))
+    return sets
+
+
+def sklearn_top_k(svc, patients_symptoms):
+    with symptom_vocabulary.encoded(patients_symptoms) as input_matrix:
+        scores = svc.decision_function(input_matrix)
+    return np.argsort(-scores, axis=1)[:, :TOP_K]
+
+
+def requery(svc, symptoms):
+    variations = [symptoms] + [symptoms[:i] + symptoms[i + 1:] for i in range(len(symptoms))]
+    return [get_predicted_values([v], svc)[0] for v in variations if v]
+
+
+def per_call_ms(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    kb = get_knowledge_base()
+    sets = symptom_sets()
+
+    ranked = kb.ranker.rank(sets, TOP_K)
+    agree = sum(r[0]["disease"] == p for r, p in zip(ranked, get_predicted_values(sets, kb.svc)))
+    print(f"top-1 equals predict for {agree}/{len(sets)} symptom sets")
+
+    one = max(sets[:50], key=len)
+    batch = (sets * (BATCH // len(sets) + 1))[:BATCH]
+    print(f"one patient ({len(one)} symptoms), top {TOP_K}:")
+    print(f"  predict  {per_call_ms(lambda: get_predicted_values([one], kb.svc), 200):8.3f} ms  (top 1 only)")
+    print(f"  requery  {per_call_ms(lambda: requery(kb.svc, one), 50):8.3f} ms  ({len(one) + 1} calls)")
+    print(f"  sklearn  {per_call_ms(lambda: sklearn_top_k(kb.svc, [one]), 20):8.3f} ms")
+    print(f"  ranker   {per_call_ms(lambda: kb.ranker.rank([one], TOP_K), 200):8.3f} ms")
+    print(f"{BATCH} patients, top {TOP_K}:")
+    print(f"  predict  {per_call_ms(lambda: get_predicted_values(batch, kb.svc), 3):8.1f} ms  (top 1 only)")
+    print(f"  sklearn  {per_call_ms(lambda: sklearn_top_k(kb.svc, batch), 1):8.1f} ms")
+    print(f"  ranker   {per_call_ms(lambda: kb.ranker.rank(batch, TOP_K), 3):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
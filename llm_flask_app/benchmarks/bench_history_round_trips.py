@@ -0,0 +1,86 @@
+"""Redis round trips per chat turn: clear-and-rewrite vs pipelined append.
+
+Uses an in-process fakeredis server (``pip install fakeredis``) and counts
+every command sent directly plus every pipeline flush as one round trip.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_history_round_trips
+"""
+import logging
+import time
+
+import fakeredis
+from langchain_core.messages import HumanMessage, AIMessage
+
+from src.services import history_manager
+from src.services.redis_pool import set_redis_client
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    round_trips = 0
+
+    def execute_command(self, *args, **options):
+        CountingRedis.round_trips += 1
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        execute = pipe.execute
+
+        def counted_execute(*args, **kwargs):
+            CountingRedis.round_trips += 1
+            return execute(*args, **kwargs)
+
+        pipe.execute = counted_execute
+        return pipe
+
+
+def seed(user, prior):
+    history = history_manager.ChatMessageHistory()
+    for i in range(prior // 2):
+        history.add_message(HumanMessage(content=f"question {i}"))
+        history.add_message(AIMessage(content=f"answer {i}"))
+    history_manager.save_session_chat_history(user, history)
+
+
+def old_turn(user):
+    """The turn as it was written before: N+2 LPUSHes after a DELETE."""
+    chat_history = history_manager.get_session_chat_history(user)
+    chat_history.add_message(HumanMessage(content="new question"))
+    chat_history.add_message(AIMessage(content="new answer"))
+    redis_history = history_manager.get_redis_history(f"chat_history:{user}")
+    redis_history.clear()
+    for msg in chat_history.messages:
+        redis_history.add_message(msg)
+
+
+def new_turn(user):
+    history_manager.get_session_chat_history(user)
+    history_manager.append_session_chat_history(
+        user, [HumanMessage(content="new question"), AIMessage(content="new answer")]
+    )
+
+
+def measure(turn, user, prior):
+    seed(user, prior)
+    CountingRedis.round_trips = 0
+    start = time.perf_counter()
+    turn(user)
+    return CountingRedis.round_trips, time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    set_redis_client(CountingRedis())
+
+    print(f"{'prior msgs':>10} {'old trips':>10} {'new trips':>10} {'old ms':>8} {'new ms':>8}")
+    for prior in (10, 100, 1000):
+        old_trips, old_seconds = measure(old_turn, "bench_old", prior)
+        new_trips, new_seconds = measure(new_turn, "bench_new", prior)
+        print(f"{prior:>10} {old_trips:>10} {new_trips:>10} "
+              f"{old_seconds * 1e3:>8.2f} {new_seconds * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Import-time regression check for create_app(), per blueprint profile.
+
+Each profile starts a fresh interpreter with ``-X importtime`` and the given
+ENABLED_BLUEPRINTS, imports app and calls create_app(). Reported per
+profile (best of RUNS):
+
+- imports: total self time of every module imported, from -X importtime
+- startup: wall time of ``import app`` plus create_app(), which includes
+  loading the SVC model when the medical blueprint is enabled
+
+Results are compared with import_time_baseline.json next to this file and
+the script exits non-zero when a profile is more than TOLERANCE slower.
+After an intended change, re-record the baseline with --update.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_import_time [--update]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+PROFILES = {
+    "all": "content,history,medical,ingestion,metrics",
+    "medical": "medical",
+}
+RUNS = 3
+TOLERANCE = 0.25
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_time_baseline.json")
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+SCRIPT = (
+    "import time; start = time.perf_counter(); import app; app.create_app(); "
+    "print(time.perf_counter() - start)"
+)
+
+
+def profile_once(blueprints: str) -> dict:
+    env = dict(os.environ, ENABLED_BLUEPRINTS=blueprints)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(1))
+    return {
+        "imports": sum(modules.values()) / 1e6,
+        "startup": float(result.stdout.strip().splitlines()[-1]),
+        "modules": len(modules),
+        "heaviest": sorted(modules.items(), key=lambda item: -item[1])[:5],
+    }
+
+
+def measure() -> dict:
+    results = {}
+    for name, blueprints in PROFILES.items():
+        runs = [profile_once(blueprints) for _ in range(RUNS)]
+        best = min(runs, key=lambda run: run["startup"])
+        best["imports"] = min(run["imports"] for run in runs)
+        results[name] = best
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="record the current numbers as the baseline")
+    args = parser.parse_args()
+
+    # Compile everything first so the first run doesn't pay for writing .pyc files
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "."], check=True)
+    results = measure()
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    failed = False
+    for name, result in results.items():
+        line = (f"{name:>8}: imports {result['imports']:5.2f}s  startup {result['startup']:5.2f}s  "
+                f"{result['modules']} modules")
+        expected = baseline.get(name)
+        if expected and not args.update:
+            ratio = result["startup"] / expected["startup"]
+            line += f"  ({ratio:.0%} of baseline {expected['startup']:.2f}s)"
+            if ratio > 1 + TOLERANCE:
+                line += "  REGRESSION"
+                failed = True
+        print(line)
+        heaviest = ", ".join(f"{module} {us / 1e3:.0f}ms" for module, us in result["heaviest"])
+        print(f"          heaviest self time: {heaviest}")
+
+    if args.update:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(
+                {name: {"imports": round(r["imports"], 3), "startup": round(r["startup"], 3),
+                        "modules": r["modules"]} for name, r in results.items()},
+                f, indent=2,
+            )
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Per-request logging overhead of /api/predict-medicine.
+
+Each mode runs in its own interpreter because logging is configured when
+src.config is imported. A medical-only app answers REQUESTS free-text
+requests sequentially on the Flask test client, with logs written to a
+temporary LOG_DIR and the console handler sent to /dev/null.
+
+- silenced: LOG_LEVEL=WARNING, the floor with no INFO records at all
+- sync: the three handlers called on the request thread (the old setup)
+- queue: records queued and written by the QueueListener thread
+- queue+sampled: as queue, keeping 5% of the payload records
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_logging
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REQUESTS = 3000
+TEXTS = [
+    "I have itching, skin rash and nodal skin eruptions",
+    "high fever with chills, headache and muscle pain for three days",
+    "stomach pain, acidity and vomiting after meals",
+    "continuous sneezing, shivering and watering from eyes",
+]
+MODES = {
+    "silenced": {"LOG_LEVEL": "WARNING"},
+    "sync": {"LOG_QUEUE": "false"},
+    "queue": {"LOG_QUEUE": "true"},
+    "queue+sampled": {"LOG_QUEUE": "true", "LOG_PAYLOAD_SAMPLE_RATE": "0.05"},
+}
+
+
+def worker():
+    from app import create_app
+    from src.utils import logger as logger_module
+    client = create_app().test_client()
+    for text in TEXTS:
+        client.post("/api/predict-medicine", json={"text": text})
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        t = time.perf_counter()
+        response = client.post("/api/predict-medicine", json={"text": TEXTS[i % len(TEXTS)]})
+        latencies.append(time.perf_counter() - t)
+        assert response.status_code == 200
+    served = time.perf_counter() - start
+    # Wait for the writer thread so its work is counted in the total
+    if logger_module._listener is not None:
+        logger_module._listener.stop()
+        logger_module._listener = None
+    total = time.perf_counter() - start
+    latencies.sort()
+    print(json.dumps({
+        "mean": statistics.fmean(latencies),
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "served": served,
+        "total": total,
+    }))
+
+
+def run(mode_env: dict) -> dict:
+    with tempfile.TemporaryDirectory() as log_dir:
+        env = dict(os.environ, ENABLED_BLUEPRINTS="medical", LOG_DIR=log_dir, **mode_env)
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_logging", "--worker"],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    results = {name: run(env) for name, env in MODES.items()}
+    floor = results["silenced"]["mean"]
+    print(f"{REQUESTS} sequential /api/predict-medicine requests")
+    for name, r in results.items():
+        print(f"{name:>14}: mean {r['mean'] * 1e6:7.1f} us  p99 {r['p99'] * 1e6:7.1f} us  "
+              f"logging overhead {(r['mean'] - floor) * 1e6:6.1f} us/request  "
+              f"total incl. log drain {r['total']:5.2f}s")
+
+
+if __name__ == "__main__":
+    if "--worker" in sys.argv:
+        worker()
+    else:
+        main()
@@ -0,0 +1,94 @@
+"""Extracting a generated 500-page PDF: PyPDFLoader vs iter_pdf_documents.
+
+The PDF is written by hand (no extra dependencies): every page carries 40
+lines of Helvetica text. Both loaders must yield identical page text. The
+parallel path is consumed lazily, so its parent-process peak (tracemalloc)
+covers only the pages in flight. Timings are taken without tracemalloc,
+which would otherwise slow only the in-process loader.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_pdf_loader
+"""
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src.services.pdf_loader import iter_pdf_documents, _get_pool
+
+PAGES = 500
+LINES_PER_PAGE = 40
+
+
+def write_pdf(path, pages=PAGES):
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>", 3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for p in range(pages):
+        page_id, content_id = 4 + 2 * p, 5 + 2 * p
+        lines = [f"Page {p} line {i}: fever cough headache fatigue nausea dizziness" for i in range(LINES_PER_PAGE)]
+        text = "".join(f"({line}) Tj 0 -16 Td " for line in lines)
+        stream = f"BT /F1 10 Tf 40 800 Td {text}ET".encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    from langchain_community.document_loaders import PyPDFLoader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.pdf")
+        write_pdf(path)
+        list(iter_pdf_documents([path], pages_per_task=PAGES))  # start the worker processes
+
+        serial, serial_seconds = timed(lambda: PyPDFLoader(path).load())
+        parallel, parallel_seconds = timed(lambda: list(iter_pdf_documents([path])))
+        streamed = sum(len(doc.page_content) for doc in iter_pdf_documents([path]))
+        serial_peak = peak_memory(lambda: PyPDFLoader(path).load())
+        streamed_peak = peak_memory(lambda: sum(1 for _ in iter_pdf_documents([path])))
+        _get_pool().shutdown()
+
+    assert [d.page_content for d in parallel] == [d.page_content for d in serial]
+    assert [d.metadata["page"] for d in parallel] == list(range(PAGES))
+    assert streamed == sum(len(d.page_content) for d in serial)
+    print(f"{PAGES}-page PDF, {os.cpu_count()} CPUs")
+    print(f"PyPDFLoader.load():         {serial_seconds:.2f}s  peak {serial_peak / 2**20:.1f} MiB")
+    print(f"iter_pdf_documents:         {parallel_seconds:.2f}s  peak {streamed_peak / 2**20:.1f} MiB (consumed lazily)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Load test of /api/predict-medicine free-text requests, cache off vs on.
+
+Requests are drawn from up to 300 distinct symptom sets (rows of Training.csv
+phrased as sentences) with a Zipf-like popularity skew, so a few common
+presentations dominate, as they do in practice. The same sequence is sent
+with the prediction cache disabled and enabled, from THREADS client
+threads against the Flask test client.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_prediction_cache
+"""
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.services.prediction_cache import prediction_cache
+from src.services.recommedmedicine import TRAINING_DATA_DIR, extract_symptoms_from_text
+
+REQUESTS = 3000
+DISTINCT = 300
+THREADS = 8
+
+
+def build_mix(seed=7):
+    training = pd.read_csv(os.path.join(TRAINING_DATA_DIR, "Training.csv"))
+    symptom_columns = [c for c in training.columns if c != "prognosis"]
+    rows = training.drop_duplicates(subset=symptom_columns).sample(frac=1, random_state=seed)
+    texts = []
+    for _, row in rows.iterrows():
+        present = [c.replace("_", " ").strip() for c in symptom_columns if row[c] == 1]
+        text = "I have been suffering from " + ", ".join(present) + " for a few days."
+        # Skip rows whose wording the extractor can't match at all (those return 400)
+        if extract_symptoms_from_text(text):
+            texts.append(text)
+        if len(texts) == DISTINCT:
+            break
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(texts))]
+    return rng.choices(texts, weights=weights, k=REQUESTS), len(texts)
+
+
+def run(client, mix):
+    def send(text):
+        response = client.post("/api/predict-medicine", json={"text": text})
+        assert response.status_code == 200, response.json
+        return response.json["predicted_disease"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        diseases = list(pool.map(send, mix))
+    return diseases, time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    from app import create_app
+    client = create_app().test_client()
+    mix, distinct = build_mix()
+
+    configured = prediction_cache.max_entries
+    prediction_cache.max_entries = 0
+    uncached, uncached_seconds = run(client, mix)
+    prediction_cache.max_entries = configured
+    prediction_cache.clear()
+    cached, cached_seconds = run(client, mix)
+    stats = prediction_cache.stats()
+
+    assert cached == uncached
+    print(f"{REQUESTS} requests over {distinct} distinct symptom sets, {THREADS} threads")
+    print(f"cache off: {REQUESTS / uncached_seconds:8.1f} req/s")
+    print(f"cache on:  {REQUESTS / cached_seconds:8.1f} req/s  hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare identification_helper against the precompiled recommendation index.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_recommendation_index [--repeat 50]
+"""
+import argparse
+import ast
+import logging
+import time
+
+from src.utils.sym_disease import diseases_list
+from src.services.recommedmedicine import load_data, identification_helper
+from src.services.recommendation_index import build_recommendation_index, lookup_recommendations
+
+
+def _flatten(values):
+    """identification_helper returns stringified lists; parse them for comparison."""
+    items = []
+    for value in values:
+        try:
+            parsed = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            parsed = value
+        items.extend(parsed if isinstance(parsed, list) else [parsed])
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="passes over all 41 diseases")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    sym_des, precautions, workout, description, medications, diets = load_data()
+
+    start = time.perf_counter()
+    index = build_recommendation_index(description, precautions, medications, diets, workout)
+    build_seconds = time.perf_counter() - start
+
+    diseases = list(diseases_list.values())
+    calls = len(diseases) * args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for dis in diseases:
+            identification_helper(dis, description, precautions, medications, diets, workout)
+    pandas_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for dis in diseases:
+            lookup_recommendations(index, dis)
+    index_seconds = time.perf_counter() - start
+
+    # Diseases where the label spelling in diseases_list does not match the tables
+    recovered = []
+    for dis in diseases:
+        _, _, old_med, _, _ = identification_helper(dis, description, precautions, medications, diets, workout)
+        _, _, new_med, _, _ = lookup_recommendations(index, dis)
+        if not old_med and new_med:
+            recovered.append(dis)
+        elif _flatten(old_med) != new_med:
+            print(f"MISMATCH medications for {dis!r}: {_flatten(old_med)} != {new_med}")
+
+    print(f"diseases:               {len(diseases)} (indexed {len(index)})")
+    print(f"index build:            {build_seconds * 1e3:.2f} ms")
+    print(f"identification_helper:  {pandas_seconds / calls * 1e6:.1f} us/call")
+    print(f"lookup_recommendations: {index_seconds / calls * 1e6:.2f} us/call")
+    print(f"speedup:                {pandas_seconds / index_seconds:.0f}x")
+    print(f"labels only matched after name normalization: {recovered}")
+
+
+if __name__ == "__main__":
+    main()
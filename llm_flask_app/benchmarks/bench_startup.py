@@ -0,0 +1,97 @@
+"""Startup time and memory of gunicorn with and without preload_app.
+
+Starts `gunicorn -c gunicorn.conf.py` with WORKERS workers on a free port,
+waits until every worker has logged that it is ready, then sends one
+/api/predict-medicine request per worker thread. Memory is the sum of
+Pss (shared pages split between the processes that map them) over the
+master and workers, read from /proc/<pid>/smaps_rollup, so Linux only.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+WORKERS = 4
+THREADS = 2
+READY = re.compile(r"Worker (\d+) ready")
+TEXT = "I have itching, skin rash and nodal skin eruptions"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def pss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def predict(port: int) -> float:
+    body = json.dumps({"text": TEXT}).encode()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/api/predict-medicine", data=body,
+        headers={"Content-Type": "application/json"},
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        assert response.status == 200
+    return time.perf_counter() - start
+
+
+def run(preload: bool) -> dict:
+    port = free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(WORKERS), SERVER_THREADS=str(THREADS),
+               GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_PRELOAD="1" if preload else "0")
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True,
+    )
+    ready = set()
+    try:
+        for line in server.stderr:
+            match = READY.search(line)
+            if match:
+                ready.add(int(match.group(1)))
+                if len(ready) == WORKERS:
+                    break
+        ready_seconds = time.perf_counter() - start
+        # Keep draining the pipe so the server never blocks on a full stderr
+        threading.Thread(target=server.stderr.read, daemon=True).start()
+
+        with ThreadPoolExecutor(max_workers=WORKERS * THREADS) as pool:
+            latencies = list(pool.map(lambda _: predict(port), range(WORKERS * THREADS)))
+        memory = sum(pss_kib(pid) for pid in [server.pid, *ready]) / 1024
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return {"ready": ready_seconds, "first_max": max(latencies), "pss": memory}
+
+
+def main():
+    results = {preload: run(preload) for preload in (False, True)}
+    print(f"gunicorn, {WORKERS} workers x {THREADS} threads")
+    for preload, r in results.items():
+        label = "preload" if preload else "no preload"
+        print(f"{label:>10}: all workers ready {r['ready']:6.2f}s  "
+              f"slowest first request {r['first_max'] * 1e3:7.1f} ms  total Pss {r['pss']:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Streamed answers: time to first token on /process-content/stream vs the full /process-content reply.
+
+The fake chat model waits CHAT_LATENCY before its first word and
+TOKEN_LATENCY before each later one, so the gap between the two numbers is
+what a user no longer stares at a spinner for. Each streamed request is
+also checked:
+
+- events are one or more "token" events followed by a single "done"
+- the tokens joined are the answer in "done"
+- the turn reaches the conversation history only after the stream ends
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_stream
+"""
+import json
+import logging
+import statistics
+import time
+import warnings
+
+from benchmarks.fakes import install_fakes
+
+CHAT_LATENCY = 0.2
+TOKEN_LATENCY = 0.1
+REQUESTS = 20
+USER = "streamer"
+LEAFLET = "Leaflet: side effects include nausea and headache. Store below 25C."
+
+
+def parse_event(raw: str) -> tuple:
+    fields = dict(line.split(": ", 1) for line in raw.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+def history_questions(client) -> list:
+    return [turn["question"] for turn in client.get(f"/api/conversation-history/{USER}").get_json()]
+
+
+def stream_once(client, question: str) -> float:
+    """Stream one answer, checking the event sequence; returns time to the first token."""
+    start = time.perf_counter()
+    response = client.post(
+        "/api/process-content/stream", json={"username": USER, "question": question}, buffered=False
+    )
+    assert response.status_code == 200, response.status_code
+    first_token, events, pending = None, [], ""
+    for chunk in response.response:
+        pending += chunk.decode() if isinstance(chunk, bytes) else chunk
+        *complete, pending = pending.split("\n\n")
+        for raw in complete:
+            events.append(parse_event(raw))
+            if first_token is None:
+                first_token = time.perf_counter() - start
+                assert question not in history_questions(client), "history saved before the stream ended"
+    response.close()
+
+    kinds = [kind for kind, _ in events]
+    assert kinds[-1] == "done" and kinds[:-1] and set(kinds[:-1]) == {"token"}, kinds
+    done = events[-1][1]
+    assert "".join(data["token"] for _, data in events[:-1]) == done["answer"], done
+    assert question in history_questions(client), "history not saved after the stream ended"
+    return first_token
+
+
+def full_once(client, question: str) -> float:
+    start = time.perf_counter()
+    response = client.post("/api/process-content", json={"username": USER, "question": question})
+    assert response.status_code == 200, response.status_code
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    install_fakes(chat_latency=CHAT_LATENCY, chat_token_latency=TOKEN_LATENCY)
+    from app import create_app
+
+    client = create_app().test_client()
+    seed = client.post(
+        "/api/process-content",
+        json={"username": USER, "question": "warm up", "source": LEAFLET, "source_type": "raw"},
+    )
+    assert seed.status_code == 200, seed.get_json()
+
+    full = [full_once(client, f"full question {i}") for i in range(REQUESTS)]
+    streamed = [stream_once(client, f"streamed question {i}") for i in range(REQUESTS)]
+    print(f"{REQUESTS} requests, fake LLM {CHAT_LATENCY * 1e3:.0f} ms to first word, "
+          f"{TOKEN_LATENCY * 1e3:.0f} ms per later word")
+    print(f"  /process-content         full answer     p50 {statistics.median(full) * 1e3:7.1f} ms")
+    print(f"  /process-content/stream  first token     p50 {statistics.median(streamed) * 1e3:7.1f} ms")
+    print("  event sequence and history checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Symptom encoding: per-request float64 vectors and dict lookups vs the symptom vocabulary.
+
+- coverage: share of symptom names from symtoms_df.csv (written with leading
+  spaces and odd spacing) that reach the model
+- encode: building the model input for one patient and for a batch of BATCH
+- predict: encode plus svc.predict for one patient, as /api/predict-medicine does
+- key: size of a prediction cache key (sorted name tuple vs bitset)
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_symptom_encoding
+"""
+import logging
+import os
+import sys
+import timeit
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.services.recommedmedicine import TRAINING_DATA_DIR, load_model
+from src.utils.sym_disease import symptoms_dict
+from src.utils.symptom_vocabulary import symptom_vocabulary
+
+BATCH = 1000
+REPEAT = 2000
+
+
+def old_encode(patient_symptoms):
+    input_vector = np.zeros(len(symptoms_dict))
+    for item in patient_symptoms:
+        if item in symptoms_dict:
+            input_vector[symptoms_dict[item]] = 1
+    return [input_vector]
+
+
+def old_encode_batch(patients_symptoms):
+    rows, cols = [], []
+    for row, symptoms in enumerate(patients_symptoms):
+        for item in symptoms:
+            index = symptoms_dict.get(item)
+            if index is not None:
+                rows.append(row)
+                cols.append(index)
+    input_matrix = np.zeros((len(patients_symptoms), len(symptoms_dict)))
+    input_matrix[rows, cols] = 1
+    return input_matrix
+
+
+def new_encode(patients_symptoms):
+    with symptom_vocabulary.encoded(patients_symptoms) as input_matrix:
+        return input_matrix.shape
+
+
+def per_call_us(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    sym_des = pd.read_csv(os.path.join(TRAINING_DATA_DIR, "symtoms_df.csv"))
+    patients = [
+        [s for s in row if isinstance(s, str)]
+        for row in sym_des[["Symptom_1", "Symptom_2", "Symptom_3", "Symptom_4"]].itertuples(index=False)
+    ]
+    names = [s for patient in patients for s in patient]
+    old_mapped = sum(s in symptoms_dict for s in names)
+    new_mapped = sum(symptom_vocabulary.lookup(s) is not None for s in names)
+    print(f"coverage: {len(names)} symptom names from symtoms_df.csv")
+    print(f"  old: {old_mapped / len(names):6.1%} mapped, {len(names) - old_mapped} silently dropped")
+    print(f"  new: {new_mapped / len(names):6.1%} mapped, {len(names) - new_mapped} reported as unmapped")
+
+    canonical = [symptom_vocabulary.resolve(patient)[0] for patient in patients]
+    one = canonical[0]
+    batch = (canonical * (BATCH // len(canonical) + 1))[:BATCH]
+    print("encode:")
+    print(f"  one patient   old {per_call_us(lambda: old_encode(one), REPEAT):8.2f} us   "
+          f"new {per_call_us(lambda: new_encode([one]), REPEAT):8.2f} us")
+    print(f"  {BATCH} patients old {per_call_us(lambda: old_encode_batch(batch), 20):8.1f} us   "
+          f"new {per_call_us(lambda: new_encode(batch), 20):8.1f} us")
+
+    svc = load_model()
+
+    def old_predict():
+        return svc.predict(old_encode(one))[0]
+
+    def new_predict():
+        with symptom_vocabulary.encoded([one]) as input_matrix:
+            return svc.predict(input_matrix)[0]
+
+    assert old_predict() == new_predict()
+    print(f"predict: old {per_call_us(old_predict, 500):8.1f} us   new {per_call_us(new_predict, 500):8.1f} us")
+
+    old_key = tuple(sorted(one))
+    new_key = symptom_vocabulary.bitset(one)
+    old_bytes = sys.getsizeof(old_key) + sum(sys.getsizeof(s) for s in old_key)
+    print(f"key: old {old_bytes} bytes   new {sys.getsizeof(new_key)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Throughput of the Aho-Corasick symptom extractor against the original scan.
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_symptom_extractor [--notes 200] [--words 2000]
+
+Every generated note is also checked for identical output between the two
+implementations.
+"""
+import argparse
+import random
+import re
+import time
+
+from src.utils.sym_disease import symptoms_dict, symptom_mapping
+from src.utils.symptom_matcher import SymptomMatcher
+
+FILLER = (
+    "patient reports presented clinic history since last week denies smoking "
+    "examination unremarkable follow-up advised vitals stable reviewed by "
+    "attending physician plan continue current management return if worse"
+).split()
+
+
+def reference_extract(text):
+    """The three-phase scan extract_symptoms_from_text used before the automaton."""
+    text = text.lower()
+    extracted_symptoms = []
+    multi_word_symptoms = [k for k in symptom_mapping.keys() if ' ' in k]
+    for symptom in multi_word_symptoms:
+        if symptom in text:
+            mapped_symptom = symptom_mapping[symptom]
+            if mapped_symptom in symptoms_dict and mapped_symptom not in extracted_symptoms:
+                extracted_symptoms.append(mapped_symptom)
+    words = re.findall(r'\b\w+\b', text)
+    for word in words:
+        if word in symptom_mapping:
+            mapped_symptom = symptom_mapping[word]
+            if mapped_symptom in symptoms_dict and mapped_symptom not in extracted_symptoms:
+                extracted_symptoms.append(mapped_symptom)
+        elif word in symptoms_dict and word not in extracted_symptoms:
+            extracted_symptoms.append(word)
+    for symptom in symptoms_dict:
+        if symptom in text and symptom not in extracted_symptoms:
+            extracted_symptoms.append(symptom)
+    return extracted_symptoms
+
+
+def make_notes(count, words, seed):
+    rng = random.Random(seed)
+    phrases = list(symptom_mapping) + [s.replace("_", " ") for s in symptoms_dict] + list(symptoms_dict)
+    notes = []
+    for _ in range(count):
+        tokens = []
+        while len(tokens) < words:
+            if rng.random() < 0.05:
+                phrase = rng.choice(phrases)
+                tokens.append(phrase.upper() if rng.random() < 0.1 else phrase)
+            else:
+                tokens.append(rng.choice(FILLER) + rng.choice(["", "", ",", "."]))
+        notes.append(" ".join(tokens))
+    return notes
+
+
+def run(extract, notes):
+    start = time.perf_counter()
+    for note in notes:
+        extract(note)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=2000, help="words per clinical note")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matcher = SymptomMatcher(symptom_mapping, symptoms_dict)
+    build_seconds = time.perf_counter() - start
+
+    notes = make_notes(args.notes, args.words, args.seed)
+    mismatches = sum(1 for note in notes if matcher.extract(note) != reference_extract(note))
+    total_mb = sum(len(n) for n in notes) / 1e6
+
+    reference_seconds = run(reference_extract, notes)
+    matcher_seconds = run(matcher.extract, notes)
+
+    print(f"automaton build:  {build_seconds * 1e3:.1f} ms ({len(matcher._delta)} states)")
+    print(f"notes:            {len(notes)} x ~{args.words} words ({total_mb:.2f} MB)")
+    print(f"mismatches:       {mismatches}")
+    print(f"reference scan:   {total_mb / reference_seconds:.2f} MB/s, "
+          f"{reference_seconds / len(notes) * 1e3:.2f} ms/note")
+    print(f"aho-corasick:     {total_mb / matcher_seconds:.2f} MB/s, "
+          f"{matcher_seconds / len(notes) * 1e3:.2f} ms/note")
+
+
+if __name__ == "__main__":
+    main()
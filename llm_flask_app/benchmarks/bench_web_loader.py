@@ -0,0 +1,83 @@
+"""Loading 50 URLs: sequential WebBaseLoader vs ConcurrentWebLoader.
+
+Serves 50 pages from a local threaded http.server that adds a fixed delay
+per request (to stand in for network latency) and answers conditional GETs
+with 304. The concurrent loader is measured cold (empty cache) and warm
+(every page revalidated with If-None-Match).
+
+Run from llm_flask_app/:
+
+    python -m benchmarks.bench_web_loader
+"""
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.services.web_loader import ConcurrentWebLoader
+
+PAGES = 50
+DELAY = 0.05
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        body = (
+            f"<html lang='en'><head><title>Page {self.path}</title>"
+            f"<meta name='description' content='bench page'></head>"
+            f"<body><p>{'symptom text ' * 200}</p></body></html>"
+        ).encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def timed(fn):
+    start = time.perf_counter()
+    docs = fn()
+    return time.perf_counter() - start, docs
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/page/{i}" for i in range(PAGES)]
+
+    from langchain_community.document_loaders import WebBaseLoader
+
+    seq_seconds, seq_docs = timed(lambda: WebBaseLoader(urls).load())
+    with tempfile.TemporaryDirectory() as cache_dir:
+        loader = ConcurrentWebLoader(max_workers=16, per_host=8, cache_dir=cache_dir)
+        cold_seconds, cold_docs = timed(lambda: loader.load(urls))
+        warm_seconds, warm_docs = timed(lambda: loader.load(urls))
+    server.shutdown()
+
+    assert [d.page_content for d in cold_docs] == [d.page_content for d in seq_docs]
+    assert [d.metadata for d in warm_docs] == [d.metadata for d in seq_docs]
+    print(f"{PAGES} URLs, {DELAY * 1e3:.0f} ms server delay each")
+    print(f"WebBaseLoader (sequential): {seq_seconds:.2f}s")
+    print(f"ConcurrentWebLoader cold:    {cold_seconds:.2f}s")
+    print(f"ConcurrentWebLoader warm:    {warm_seconds:.2f}s (304 revalidation)")
+
+
+if __name__ == "__main__":
+    main()
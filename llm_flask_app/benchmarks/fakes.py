@@ -0,0 +1,128 @@
+"""Deterministic, latency-configurable stand-ins for Gemini and Redis.
+
+install_fakes() swaps them into the service singletons before create_app()
+is called, so the whole API runs offline:
+
+- chat: FakeChatModel, answers derived from a hash of the prompt, streamed word by word
+- embeddings: DeterministicFakeEmbedding behind the usual SQLite cache
+- Redis: one fakeredis server shared by the sync and async clients
+- FAISS indexes, uploads and the embedding cache go to a temp directory
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from typing import AsyncIterator, Iterator, List
+
+import fakeredis
+import fakeredis.aioredis
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.config import EMBEDDING_CACHE_MAX_ENTRIES
+from src.services import answer_cache, content_loader, embedding_cache, llm_processor, redis_pool, vector_store
+
+
+class FakeChatModel(BaseChatModel):
+    """Sleeps ``latency`` seconds per call, then answers deterministically from the prompt.
+
+    Streaming yields the answer one word at a time: the first after
+    ``latency``, each later one after ``token_latency``. A call that is not
+    streamed waits for all of them before returning.
+    """
+
+    latency: float = 0.0
+    token_latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _answer(self, messages) -> str:
+        digest = hashlib.sha256(str(messages[-1].content).encode("utf-8")).hexdigest()[:12]
+        return f"Fake answer {digest}."
+
+    def _result(self, messages) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
+
+    def _tokens(self, messages) -> List[str]:
+        words = self._answer(messages).split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+
+    def _total_latency(self, messages) -> float:
+        return self.latency + self.token_latency * (len(self._tokens(messages)) - 1)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._total_latency(messages))
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._total_latency(messages))
+        return self._result(messages)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for position, token in enumerate(self._tokens(messages)):
+            time.sleep(self.token_latency if position else self.latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for position, token in enumerate(self._tokens(messages)):
+            await asyncio.sleep(self.token_latency if position else self.latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+class FakeEmbeddings(Embeddings):
+    """DeterministicFakeEmbedding with ``latency`` seconds per API call (one batch or one query)."""
+
+    def __init__(self, size: int = 64, latency: float = 0.0):
+        self.inner = DeterministicFakeEmbedding(size=size)
+        self.latency = latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self.inner.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency)
+        return self.inner.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency)
+        return self.inner.embed_query(text)
+
+
+def install_fakes(
+    chat_latency: float = 0.0, embedding_latency: float = 0.0, workdir: str = None, chat_token_latency: float = 0.0
+) -> str:
+    """Point every external dependency at a fake; returns the working directory used."""
+    workdir = workdir or tempfile.mkdtemp(prefix="bench-")
+    server = fakeredis.FakeServer()
+    redis_pool.set_redis_client(fakeredis.FakeRedis(server=server))
+    redis_pool.set_async_redis_client_factory(lambda: fakeredis.aioredis.FakeRedis(server=server))
+
+    embeddings = FakeEmbeddings(latency=embedding_latency)
+    llm_processor.set_embeddings(embeddings)
+    llm_processor.set_chat_model(FakeChatModel(latency=chat_latency, token_latency=chat_token_latency))
+    # The cache looks the client up on each call, so it follows set_embeddings()
+    embedding_cache.set_cached_embeddings(embedding_cache.CachedEmbeddings(
+        None, "fake", os.path.join(workdir, "embeddings.sqlite3"), EMBEDDING_CACHE_MAX_ENTRIES
+    ))
+    vector_store.vector_store_manager.base_dir = os.path.join(workdir, "faissdb")
+    content_loader.UPLOAD_DIR = os.path.join(workdir, "data")
+    # Every request runs the full pipeline; repeated questions would otherwise be cache hits
+    answer_cache.ANSWER_CACHE_BACKEND = "off"
+    answer_cache.set_answer_cache(None)
+    return workdir
@@ -0,0 +1,54 @@
+"""gunicorn settings: preloaded app, threaded workers and graceful shutdown.
+
+    gunicorn -c gunicorn.conf.py                 # wsgi:app
+    GUNICORN_APP=asgi:app GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \\
+        gunicorn -c gunicorn.conf.py             # async /api/process-content
+
+Worker counts and timeouts come from src/config.py (WEB_CONCURRENCY,
+SERVER_THREADS, SERVER_TIMEOUT, SERVER_GRACEFUL_TIMEOUT, ...).
+"""
+import os
+from src.config import (
+    ENABLED_BLUEPRINTS,
+    HOST,
+    PORT,
+    SERVER_WORKERS,
+    SERVER_THREADS,
+    SERVER_TIMEOUT,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_KEEPALIVE,
+    SERVER_MAX_REQUESTS,
+    SERVER_MAX_REQUESTS_JITTER,
+)
+
+wsgi_app = os.getenv("GUNICORN_APP", "wsgi:app")
+bind = os.getenv("GUNICORN_BIND", f"{HOST}:{PORT}")
+workers = SERVER_WORKERS
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = SERVER_THREADS
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+keepalive = SERVER_KEEPALIVE
+max_requests = SERVER_MAX_REQUESTS
+max_requests_jitter = SERVER_MAX_REQUESTS_JITTER
+
+# Import the app, the model and the tables once in the master; forked workers
+# share those pages instead of each loading their own copy
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
+# The root logger from src.config already writes to console and logs/
+accesslog = None
+
+
+def post_worker_init(worker):
+    # gRPC channels can't cross a fork, so the LLM clients are built per worker,
+    # still before the worker accepts its first request
+    if {"content", "ingestion"} & set(ENABLED_BLUEPRINTS):
+        from src.services.llm_processor import warm_up_llm_clients
+        warm_up_llm_clients()
+    worker.log.info(f"Worker {worker.pid} ready")
+
+
+def worker_exit(server, worker):
+    if "ingestion" in ENABLED_BLUEPRINTS:
+        from src.services.ingestion_jobs import shutdown_ingestion_jobs
+        shutdown_ingestion_jobs()
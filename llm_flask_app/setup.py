@@ -10,13 +10,14 @@ setup(
     description="A Flask-base application with the medicine prediction model",
     author="Seven Chromosome",
     author_email="rabindraabasnet@gmail.com", 
-    packages=find_packages(where="."),  
+    packages=find_packages(where="."),
+    py_modules=["app", "wsgi", "asgi"],
     package_dir={"": "."},  
     install_requires=requirements,  
     include_package_data=True,
     entry_points={
         "console_scripts": [
-            "llm-flask-app=app:create_app" 
+            "llm-flask-app=app:main"
         ]
     },
     python_requires=">=3.12",  
@@ -1,9 +1,107 @@
+import os
 from src.utils.logger import setup_logger
 
 
 REDIS_HISTORY_URL = "redis://localhost:6379/1"
-HOST = "0.0.0.0"
+REDIS_POOL_MAX_CONNECTIONS = int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "50"))
+# Seconds to wait for a free pooled connection before failing the request
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2"))
+# Idle pooled connections are PINGed before reuse if unused for this many seconds
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+# Keep at most this many chat messages per user (None keeps everything); use an
+# even number so question/answer pairs are trimmed together
+CHAT_HISTORY_MAX_MESSAGES = None
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "5000"))
 USER_AGENT= "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-DEBUG= True
+# Flask debugger and reloader for `python app.py`; never enable it in production
+DEBUG = os.getenv("FLASK_DEBUG", "false").lower() in ("1", "true", "yes")
+# Blueprints registered by create_app(); each one's modules (and their langchain,
+# FAISS, loader imports) are imported only if it is listed, so e.g.
+# ENABLED_BLUEPRINTS=medical starts a prediction-only worker
+ENABLED_BLUEPRINTS = [
+    name.strip()
+    for name in os.getenv("ENABLED_BLUEPRINTS", "content,history,medical,ingestion,metrics").split(",")
+    if name.strip()
+]
+# Production server (gunicorn.conf.py): worker processes, threads per worker,
+# seconds a request may run, seconds in-flight requests get to finish on
+# shutdown, keep-alive seconds, and requests after which a worker is recycled
+# (0 never recycles; each restart drops that worker's caches)
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", str(2 * (os.cpu_count() or 1) + 1)))
+SERVER_THREADS = int(os.getenv("SERVER_THREADS", "4"))
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "120"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "5"))
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "0"))
+# Concurrent web loading: total fetch threads, simultaneous requests per host,
+# (connect, read) timeouts in seconds and retries for connection errors/5xx/429
+WEB_FETCH_WORKERS = int(os.getenv("WEB_FETCH_WORKERS", "16"))
+WEB_FETCH_PER_HOST = int(os.getenv("WEB_FETCH_PER_HOST", "4"))
+WEB_FETCH_TIMEOUT = (5.0, 20.0)
+WEB_FETCH_RETRIES = 2
+WEB_FETCH_BACKOFF = 0.5
+# Seconds between checks of svc.pkl / trainingdata for changes; None disables hot reload
+MODEL_RELOAD_CHECK_INTERVAL = 5.0
+BATCH_PREDICT_MAX_PATIENTS = 1000
+# Largest top_k accepted for a differential diagnosis (ranked alternative diseases)
+DIFFERENTIAL_MAX_TOP_K = int(os.getenv("DIFFERENTIAL_MAX_TOP_K", "10"))
+# Distinct symptom sets whose prediction payload is memoized; 0 disables the cache
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "4096"))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # llm_flask_app/
+FAISS_DB_DIR = os.path.join(BASE_DIR, "faissdb")
+# Memory budget for per-user FAISS indexes kept warm between requests
+VECTOR_STORE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+UPLOAD_DIR = os.path.join(BASE_DIR, "data")
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+# Chunks embedded and indexed per batch when a source is ingested
+INGESTION_BATCH_SIZE = 32
+# A background ingestion job writes its partly built index to disk at most this
+# often (seconds), so other workers see progress; the full index is saved at the end
+INGESTION_CHECKPOINT_SECONDS = float(os.getenv("INGESTION_CHECKPOINT_SECONDS", "10"))
+# (chunk_size, chunk_overlap) for the text splitter, per source type
+DEFAULT_CHUNK_SETTINGS = (10000, 1000)
+CHUNK_SETTINGS = {
+    "pdf": (10000, 1000),
+    "web": (10000, 1000),
+    "text": (10000, 1000),
+    "raw": (10000, 1000),
+}
+# Text files are read in blocks of about this many characters instead of whole
+TEXT_BLOCK_CHARS = 1_000_000
+# Ingestion job records are kept in Redis for this many seconds after their last
+# update; a user's job list shows at most INGESTION_MAX_JOBS of the newest
+INGESTION_JOB_TTL = int(os.getenv("INGESTION_JOB_TTL", "86400"))
+INGESTION_MAX_JOBS = 1000
+# Parallel PDF extraction: worker processes, pages per task, tasks submitted
+# ahead of the page being yielded, and the page count below which extraction
+# stays in-process
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PAGES_PER_TASK = 32
+PDF_MAX_IN_FLIGHT = 2 * PDF_WORKERS
+PDF_PARALLEL_MIN_PAGES = 32
+# Answers to repeated questions over the same chunks: "local" (per process),
+# "redis" (shared by all workers) or "off"
+ANSWER_CACHE_BACKEND = os.getenv("ANSWER_CACHE_BACKEND", "local")
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_MAX_ENTRIES = 10_000
+EMBEDDING_MODEL = "models/embedding-001"
+EMBEDDING_CACHE_PATH = os.path.join(BASE_DIR, "cache", "embeddings.sqlite3")
+EMBEDDING_CACHE_MAX_ENTRIES = 100_000
+# Fetched pages plus their ETag/Last-Modified, revalidated with conditional GETs
+WEB_CACHE_DIR = os.path.join(BASE_DIR, "cache", "web")
 
-logger = setup_logger()
+# Logging: root level; per-module overrides such as
+# "src.routes.medical_routes=WARNING,werkzeug=ERROR"; whether records are
+# formatted and written by a background thread instead of the request thread;
+# and the share of request-payload records (questions, answers, symptoms) kept
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_QUEUE = os.getenv("LOG_QUEUE", "true").lower() in ("1", "true", "yes")
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "1.0"))
+LOG_DIR = os.getenv("LOG_DIR", os.path.join(BASE_DIR, "logs"))
+
+logger = setup_logger(LOG_LEVEL, LOG_LEVELS, LOG_QUEUE, LOG_PAYLOAD_SAMPLE_RATE, LOG_DIR)
@@ -0,0 +1,77 @@
+import asyncio
+import traceback
+from datetime import datetime
+from langchain_core.messages import HumanMessage, AIMessage
+from src.routes.content_routes import get_user_vector_store
+from src.services.history_manager import aget_session_chat_history, asave_turn
+from src.services.qa_pipeline import aanswer_question
+from src.config import logger
+from src.utils.logger import PAYLOAD
+
+
+async def process_content(data: dict):
+    """Async /api/process-content for the ASGI server; same inputs and response body.
+
+    Indexing and FAISS loading are blocking and run on a worker thread; the
+    LLM calls, query embedding and Redis history are awaited, so a waiting
+    chat holds no thread. Returns (payload, status).
+    """
+    source = data.get("source")
+    source_type = data.get("source_type")
+    user_question = data.get("question")
+    user_name = data.get("username")
+
+    if not user_name:
+        logger.warning("No username provided in request.")
+        return {"error": "Please provide a username."}, 400
+    if not user_question:
+        logger.warning("No question provided in request.")
+        return {"error": "Please provide a question."}, 400
+
+    user_name = user_name.lower()
+    try:
+        logger.info("Processing content for question: %s by user: %s", user_question, user_name, extra=PAYLOAD)
+        (vector_store, indexing, error), chat_history = await asyncio.gather(
+            asyncio.to_thread(get_user_vector_store, source, source_type, user_name),
+            aget_session_chat_history(user_name),
+        )
+        if error:
+            return error
+
+        retriever = vector_store.as_retriever(search_kwargs={"k": 4})
+        result = await aanswer_question(retriever, user_question, chat_history)
+        answer = result["answer"]
+        logger.info("Answer generated: %s", answer, extra=PAYLOAD)
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        await asave_turn(
+            user_name,
+            [HumanMessage(content=user_question), AIMessage(content=answer)],
+            (
+                user_question,
+                answer,
+                timestamp,
+                str(source) if source else "existing_vector_store",
+                source_type if source_type else "unknown",
+            ),
+        )
+
+        return {
+            "question": user_question,
+            "answer": answer,
+            "source": source or "existing_vector_store",
+            "source_type": source_type or "unknown",
+            "indexing": indexing,
+            "cache": result["cache"],
+            "timestamp": timestamp
+        }, 200
+    except Exception as e:
+        error_msg = f"Error: {str(e)}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        return {"error": error_msg}, 500
+
+
+# (method, path) -> async handler(json body) -> (payload, status)
+ASYNC_ROUTES = {
+    ("POST", "/api/process-content"): process_content,
+}
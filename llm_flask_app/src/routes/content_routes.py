@@ -1,20 +1,74 @@
-from flask import request, jsonify, Blueprint
-from src.services.content_loader import load_content, get_text_chunks
+from flask import request, jsonify, Blueprint, Response, stream_with_context
+from src.services.content_loader import save_uploaded_file, upload_source_key, source_label
 from src.services.vector_store import get_vector_store
-from src.services.llm_processor import get_conversational_chain
+from src.services.source_indexer import index_sources
+from src.services.embedding_cache import get_cached_embeddings
+from src.services.llm_processor import get_question_answer_chain
+from src.services.qa_pipeline import answer_question, prepare_answer, store_answer
+from src.services.answer_cache import get_answer_cache
 from src.services.history_manager import (
-    get_session_chat_history, save_session_chat_history, save_conversation_to_redis
+    get_session_chat_history, append_session_chat_history, save_conversation_to_redis
 )
-from werkzeug.utils import secure_filename
 from datetime import datetime
 from langchain_core.messages import HumanMessage, AIMessage
+from src.utils.metrics import observe, get_summary, traced
 from src.config import logger
+from src.utils.logger import PAYLOAD
 import traceback
-from pathlib import Path
+import json
+import time
 import re
 
 content_bp = Blueprint("content", __name__)
 
+
+@traced("content.vector_store")
+def get_user_vector_store(source, source_type, user_name):
+    """Index the source (if any); returns (vector_store, indexing report, (error dict, status) or None)."""
+    # Incrementally index the source if provided: unchanged files and known chunks are reused
+    report = None
+    if source:
+        logger.info("Loading content from source: %s (type: %s)", source_label(source, source_type), source_type or "unknown")
+        vector_store, report = index_sources(user_name, source, source_type or "unknown")
+        if not report["chunks_total"]:
+            logger.warning("No text chunks created from source: %s", source_label(source, source_type))
+            return None, None, ({"error": "No text chunks created from the source."}, 400)
+        logger.info(f"Loaded {report['chunks_total']} text chunks for user: {user_name}")
+    else:
+        vector_store = get_vector_store([], user_name)
+
+    if not vector_store and not report:
+        logger.warning(f"No indexed documents for user: {user_name}")
+        return None, None, ({"error": "No documents indexed for this user. Please provide a source."}, 400)
+    if not vector_store:
+        logger.error("Failed to retrieve vector store.")
+        return None, None, ({"error": "Failed to retrieve vector store."}, 500)
+    return vector_store, report, None
+
+
+def _save_turn(user_name, question, answer, source, source_type):
+    """Persist a finished question/answer turn; returns its timestamp."""
+    # Update chat history
+    append_session_chat_history(user_name, [HumanMessage(content=question), AIMessage(content=answer)])
+
+    # Save to user-specific conversation history
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conversation_entry = (
+        question,
+        answer,
+        timestamp,
+        str(source) if source else "existing_vector_store",
+        source_type if source_type else "unknown"
+    )
+    save_conversation_to_redis(user_name, conversation_entry)
+    logger.info(f"Conversation saved to Redis for user: {user_name}")
+    return timestamp
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @content_bp.route("/process-content", methods=["POST"])
 def process_content():
     data = request.get_json()
@@ -32,63 +86,32 @@ def process_content():
 
     user_name = user_name.lower()
     try:
-        logger.info(f"Processing content for question: {user_question} by user: {user_name}")
+        logger.info("Processing content for question: %s by user: %s", user_question, user_name, extra=PAYLOAD)
         
-        # Load text chunks if source is provided
-        text_chunks = []
-        if source:
-            logger.info(f"Loading content from sourceMyth: {source} (type: {source_type or 'unknown'})")
-            documents = load_content(source, source_type or "unknown")
-            if not documents:
-                logger.warning(f"No content loaded from source: {source}")
-                return jsonify({"error": "No content loaded from the source."}), 400
-            
-            text_chunks = get_text_chunks(documents)
-            if not text_chunks:
-                logger.warning(f"No text chunks created from source: {source}")
-                return jsonify({"error": "No text chunks created from the source."}), 400
-            logger.info(f"Loaded {len(text_chunks)} text chunks for user: {user_name}")
-
-        # Get vector store
-        vector_store = get_vector_store(text_chunks, user_name)
-        if not vector_store:
-            logger.error("Failed to retrieve vector store.")
-            return jsonify({"error": "Failed to retrieve vector store."}), 500
+        vector_store, indexing, error = get_user_vector_store(source, source_type, user_name)
+        if error:
+            return error
 
         retriever = vector_store.as_retriever(search_kwargs={"k": 4})
-        chain = get_conversational_chain(retriever)
 
         # Load chat history
         chat_history = get_session_chat_history(user_name)
         logger.info(f"Loaded chat history with {len(chat_history.messages)} messages for {user_name}")
 
-        # Invoke the chain
-        result = chain.invoke({"input": user_question, "chat_history": chat_history.messages})
+        # Standalone question -> retrieval -> answer cache -> QA chain on a miss
+        result = answer_question(retriever, user_question, chat_history.messages)
         answer = result["answer"]
-        logger.info(f"Answer generated: {answer}")
-
-        # Update chat history
-        chat_history.add_message(HumanMessage(content=user_question))
-        chat_history.add_message(AIMessage(content=answer))
-        save_session_chat_history(user_name, chat_history)
-
-        # Save to user-specific conversation history
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        conversation_entry = (
-            user_question,
-            answer,
-            timestamp,
-            str(source) if source else "existing_vector_store",
-            source_type if source_type else "unknown"
-        )
-        save_conversation_to_redis(user_name, conversation_entry)
-        logger.info(f"Conversation saved to Redis for user: {user_name}")
+        logger.info("Answer generated: %s", answer, extra=PAYLOAD)
+
+        timestamp = _save_turn(user_name, user_question, answer, source, source_type)
 
         return jsonify({
             "question": user_question,
             "answer": answer,
             "source": source or "existing_vector_store",
             "source_type": source_type or "unknown",
+            "indexing": indexing,
+            "cache": result["cache"],
             "timestamp": timestamp
         }), 200
     except Exception as e:
@@ -97,12 +120,98 @@ def process_content():
         return jsonify({"error": error_msg}), 500
 
 
+@content_bp.route("/process-content/stream", methods=["POST"])
+def process_content_stream():
+    """Same inputs as /process-content; answer tokens are sent as server-sent events."""
+    # Time to first token is measured from here, as the client sees it
+    start = time.perf_counter()
+    data = request.get_json()
+    source = data.get("source")
+    source_type = data.get("source_type")
+    user_question = data.get("question")
+    user_name = data.get("username")
+
+    if not user_name:
+        logger.warning("No username provided in request.")
+        return jsonify({"error": "Please provide a username."}), 400
+    if not user_question:
+        logger.warning("No question provided in request.")
+        return jsonify({"error": "Please provide a question."}), 400
+
+    user_name = user_name.lower()
+    try:
+        logger.info("Streaming answer for question: %s by user: %s", user_question, user_name, extra=PAYLOAD)
+        vector_store, indexing, error = get_user_vector_store(source, source_type, user_name)
+        if error:
+            return error
+
+        retriever = vector_store.as_retriever(search_kwargs={"k": 4})
+        chat_history = get_session_chat_history(user_name)
+        prepared = prepare_answer(retriever, user_question, chat_history.messages)
+    except Exception as e:
+        error_msg = f"Error: {str(e)}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        return jsonify({"error": error_msg}), 500
+
+    def generate():
+        first_token = True
+        answer_parts = []
+        try:
+            if prepared["cached"]:
+                tokens = [prepared["cached"]["answer"]]
+            else:
+                tokens = get_question_answer_chain().stream({
+                    "input": user_question,
+                    "chat_history": chat_history.messages,
+                    "context": prepared["context"],
+                })
+            for token in tokens:
+                if not token:
+                    continue
+                if first_token:
+                    first_token = False
+                    observe("stream_time_to_first_token", time.perf_counter() - start)
+                answer_parts.append(token)
+                yield _sse("token", {"token": token})
+
+            answer = "".join(answer_parts)
+            observe("stream_total", time.perf_counter() - start)
+            logger.info("Answer streamed: %s", answer, extra=PAYLOAD)
+            if not prepared["cached"]:
+                store_answer(prepared["cache_key"], answer)
+
+            # Persist only once the full answer is known
+            timestamp = _save_turn(user_name, user_question, answer, source, source_type)
+            yield _sse("done", {
+                "question": user_question,
+                "answer": answer,
+                "source": source or "existing_vector_store",
+                "source_type": source_type or "unknown",
+                "indexing": indexing,
+                "cache": prepared["cache"],
+                "timestamp": timestamp
+            })
+        except Exception as e:
+            logger.error(f"Error while streaming answer: {str(e)}\n{traceback.format_exc()}")
+            yield _sse("error", {"error": str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@content_bp.route("/stream-metrics", methods=["GET"])
+def stream_metrics():
+    return jsonify({
+        "time_to_first_token": get_summary("stream_time_to_first_token"),
+        "total": get_summary("stream_total"),
+    }), 200
+
+
 @content_bp.route("/process-file-content", methods=["POST"])
 def process_file_content():
-    # Set data directory
-    data_dir = Path(__file__).parent.parent.parent / "data"  # Resolves to llm_flask_app/data
-    data_dir.mkdir(exist_ok=True)
-
     # Ensure multipart/form-data
     if not request.content_type.startswith("multipart/form-data"):
         logger.warning("Expected multipart/form-data")
@@ -117,6 +226,7 @@ def process_file_content():
     username = request.form.get("username", "").lower()
     question = request.form.get("question")
     source_type = request.form.get("source_type")
+    source_id = request.form.get("source_id")
 
     # Validate inputs
     if not username or not re.match(r"^[a-zA-Z0-9_-]+$", username):
@@ -128,59 +238,38 @@ def process_file_content():
     if source_type not in ["pdf", "docx", "text", "raw"]:
         logger.warning(f"Invalid source_type: {source_type}")
         return jsonify({"error": "Source type must be pdf, docx, text, or raw"}), 400
+    if source_id and not re.match(r"^[a-zA-Z0-9_.-]{1,128}$", source_id):
+        logger.warning(f"Invalid source_id: {source_id}")
+        return jsonify({"error": "source_id may only contain letters, digits, '.', '_' and '-'"}), 400
 
     # Save file
-    filename = secure_filename(file.filename)
-    user_dir = data_dir / username
-    user_dir.mkdir(exist_ok=True, parents=True)
-    source = user_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
-    logger.info(f"Saving file to: {source}")
     try:
-        file.save(source)
-        logger.info(f"File saved: {source}")
+        source = save_uploaded_file(file, username)
     except Exception as e:
         logger.error(f"Failed to save file: {str(e)}")
         return jsonify({"error": f"Failed to save file: {str(e)}"}), 500
 
     # Process file
     try:
-        documents = load_content(str(source), source_type)
-        if not documents:
-            logger.warning(f"No content from {source}")
-            return jsonify({"error": "Failed to load content"}), 400
-
-        text_chunks = get_text_chunks(documents)
-        if not text_chunks:
+        vector_store, indexing = index_sources(
+            username, str(source), source_type, source_key=upload_source_key(file.filename, source_id)
+        )
+        if not indexing["chunks_total"]:
             logger.warning(f"No chunks from {source}")
             return jsonify({"error": "Failed to create chunks"}), 400
-        logger.info(f"Loaded {len(text_chunks)} chunks for {username}")
+        logger.info(f"Loaded {indexing['chunks_total']} chunks for {username}")
 
-        vector_store = get_vector_store(text_chunks, username)
         if not vector_store:
             logger.error("Failed to create vector store")
             return jsonify({"error": "Failed to create vector store"}), 500
 
         retriever = vector_store.as_retriever(search_kwargs={"k": 4})
-        chain = get_conversational_chain(retriever)
         chat_history = get_session_chat_history(username)
 
-        result = chain.invoke({"input": question, "chat_history": chat_history.messages})
+        result = answer_question(retriever, question, chat_history.messages)
         answer = result["answer"]
 
-        chat_history.add_message(HumanMessage(content=question))
-        chat_history.add_message(AIMessage(content=answer))
-        save_session_chat_history(username, chat_history)
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        conversation_entry = (
-            question,
-            answer,
-            timestamp,
-            str(source),
-            source_type
-        )
-        save_conversation_to_redis(username, conversation_entry)
-        logger.info(f"Conversation saved to Redis for user: {username}")
+        timestamp = _save_turn(username, question, answer, source, source_type)
 
         return jsonify({
             "status": "success",
@@ -188,11 +277,32 @@ def process_file_content():
                 "question": question,
                 "answer": answer,
                 "source": str(source),
-                "source_type": source_type
+                "source_type": source_type,
+                "indexing": indexing,
+                "cache": result["cache"]
             },
             "timestamp": timestamp
         }), 200
 
     except Exception as e:
         logger.error(f"Error: {str(e)}\n{traceback.format_exc()}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@content_bp.route("/answer-cache-stats", methods=["GET"])
+def answer_cache_stats():
+    try:
+        cache = get_answer_cache()
+        return jsonify(cache.stats() if cache else {"backend": "off"}), 200
+    except Exception as e:
+        logger.error(f"Error reading answer cache stats: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@content_bp.route("/embedding-cache-stats", methods=["GET"])
+def embedding_cache_stats():
+    try:
+        return jsonify(get_cached_embeddings().stats()), 200
+    except Exception as e:
+        logger.error(f"Error reading embedding cache stats: {str(e)}")
+        return jsonify({"error": str(e)}), 500
@@ -4,9 +4,8 @@ from src.services.history_manager import (
     save_history_to_csv,
     clear_conversation_history_in_redis,
 )
-from src.services.vector_store import clear_user_vector_store
-from src.config import logger, REDIS_HISTORY_URL
-from langchain_community.chat_message_histories import RedisChatMessageHistory
+from src.services.redis_pool import get_redis_history, get_pool_stats
+from src.config import logger
 
 history_bp = Blueprint("history", __name__)
 
@@ -84,10 +83,7 @@ def clear_vector_store(username):
         
         # Clear Redis chat history
         session_id = f"chat_history:{username}"
-        redis_history = RedisChatMessageHistory(
-            session_id=session_id,
-            url=REDIS_HISTORY_URL
-        )
+        redis_history = get_redis_history(session_id)
         message_count = len(redis_history.messages)
         logger.info(f"Found {message_count} messages in Redis for {username}")
         
@@ -101,7 +97,8 @@ def clear_vector_store(username):
         # Clear conversation history (optional, if you want to clear both)
         clear_conversation_history_in_redis(username)
         
-        # Clear vector store
+        # Clear vector store; FAISS and langchain are only imported by this endpoint
+        from src.services.vector_store import clear_user_vector_store
         vector_result = clear_user_vector_store(username)
         logger.info(f"Vector store cleared: {vector_result}")
         
@@ -111,4 +108,13 @@ def clear_vector_store(username):
         }), 200
     except Exception as e:
         logger.error(f"Error clearing history for {username}: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@history_bp.route("/redis-pool-stats", methods=["GET"])
+def redis_pool_stats():
+    try:
+        return jsonify(get_pool_stats()), 200
+    except Exception as e:
+        logger.error(f"Error reading Redis pool stats: {str(e)}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,91 @@
+from flask import request, jsonify, Blueprint, url_for
+from src.services.content_loader import save_uploaded_file, upload_source_key
+from src.services.ingestion_jobs import submit_ingestion_job, get_job, list_jobs
+from src.config import logger
+import re
+
+ingestion_bp = Blueprint("ingestion", __name__)
+
+
+def _accepted(job):
+    return jsonify({
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": url_for("ingestion.ingestion_status", job_id=job["job_id"]),
+    }), 202
+
+
+@ingestion_bp.route("/ingest", methods=["POST"])
+def ingest_content():
+    data = request.get_json(silent=True) or {}
+    source = data.get("source")
+    source_type = data.get("source_type")
+    user_name = data.get("username")
+
+    if not user_name:
+        logger.warning("No username provided in request.")
+        return jsonify({"error": "Please provide a username."}), 400
+    if not source:
+        logger.warning("No source provided in request.")
+        return jsonify({"error": "Please provide a source."}), 400
+    if source_type not in ["pdf", "web", "text", "raw"]:
+        logger.warning(f"Invalid source_type: {source_type}")
+        return jsonify({"error": "Source type must be pdf, web, text, or raw"}), 400
+
+    try:
+        job = submit_ingestion_job(user_name.lower(), source, source_type)
+        return _accepted(job)
+    except Exception as e:
+        logger.error(f"Error queueing ingestion for {user_name}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@ingestion_bp.route("/ingest-file", methods=["POST"])
+def ingest_file():
+    if not request.content_type or not request.content_type.startswith("multipart/form-data"):
+        logger.warning("Expected multipart/form-data")
+        return jsonify({"error": "Use multipart/form-data"}), 400
+    if "file" not in request.files or not request.files["file"].filename:
+        logger.warning("No file provided")
+        return jsonify({"error": "File required"}), 400
+
+    file = request.files["file"]
+    username = request.form.get("username", "").lower()
+    source_type = request.form.get("source_type")
+    source_id = request.form.get("source_id")
+
+    if not username or not re.match(r"^[a-zA-Z0-9_-]+$", username):
+        logger.warning(f"Invalid username: {username}")
+        return jsonify({"error": "Valid username required"}), 400
+    if source_type not in ["pdf", "text", "raw"]:
+        logger.warning(f"Invalid source_type: {source_type}")
+        return jsonify({"error": "Source type must be pdf, text, or raw"}), 400
+    if source_id and not re.match(r"^[a-zA-Z0-9_.-]{1,128}$", source_id):
+        logger.warning(f"Invalid source_id: {source_id}")
+        return jsonify({"error": "source_id may only contain letters, digits, '.', '_' and '-'"}), 400
+
+    try:
+        source = save_uploaded_file(file, username)
+    except Exception as e:
+        logger.error(f"Failed to save file: {str(e)}")
+        return jsonify({"error": f"Failed to save file: {str(e)}"}), 500
+
+    try:
+        job = submit_ingestion_job(username, str(source), source_type, upload_source_key(file.filename, source_id))
+        return _accepted(job)
+    except Exception as e:
+        logger.error(f"Error queueing ingestion for {username}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@ingestion_bp.route("/ingest/<job_id>", methods=["GET"])
+def ingestion_status(job_id):
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    return jsonify(job), 200
+
+
+@ingestion_bp.route("/ingest/jobs/<username>", methods=["GET"])
+def ingestion_jobs(username):
+    return jsonify(list_jobs(username.lower())), 200
@@ -1,16 +1,116 @@
 from flask import request, jsonify, Blueprint
 from src.services.recommedmedicine import (
-    load_data, load_model, get_predicted_value, identification_helper, extract_symptoms_from_text
+    get_predicted_value, get_predicted_values, extract_symptoms_from_text
 )
-from src.config import logger
+from src.services.recommendation_index import lookup_recommendations
+from src.services.model_registry import get_knowledge_base, get_registry
+from src.services.prediction_cache import prediction_cache, prediction_key
+from src.utils.symptom_vocabulary import symptom_vocabulary
+from src.config import logger, BATCH_PREDICT_MAX_PATIENTS, DIFFERENTIAL_MAX_TOP_K
+from src.utils.logger import PAYLOAD
+from src.utils.metrics import timed
 
 medical_bp = Blueprint("medical_bp", __name__)
 
+
+def _resolve_symptoms(data):
+    """Return (symptoms, unmapped, error) from a payload with either 'symptoms' or 'text'.
+
+    Symptoms are canonical names; unmapped are the given ones the model doesn't know.
+    """
+    # Check if symptoms are provided directly or extract from text
+    if 'symptoms' in data and isinstance(data['symptoms'], list):
+        symptoms = data['symptoms']
+    elif 'text' in data and isinstance(data['text'], str):
+        text = data['text'].strip()
+        if not text:
+            logger.warning("Empty text provided.")
+            return None, None, "Empty text provided."
+        symptoms = extract_symptoms_from_text(text)
+        logger.info("Extracted symptoms from text: %s", symptoms, extra=PAYLOAD)
+    else:
+        logger.warning("Invalid input. Provide either 'symptoms' as a list or 'text' as a string.")
+        return None, None, "Invalid input. Provide either 'symptoms' as a list or 'text' as a string."
+
+    # Check if any symptoms were extracted
+    if not symptoms:
+        logger.warning("No symptoms detected in the provided input.")
+        return None, None, "No symptoms detected in the provided input."
+
+    symptoms, unmapped = symptom_vocabulary.resolve(symptoms)
+    if unmapped:
+        logger.info("Unmapped symptoms: %s", unmapped, extra=PAYLOAD)
+    if not symptoms:
+        logger.warning("None of the provided symptoms are recognised.")
+        return None, None, "None of the provided symptoms are recognised."
+    return symptoms, unmapped, None
+
+
+def _resolve_top_k(data):
+    """Return (top_k, error); top_k is None when no differential diagnosis was asked for."""
+    top_k = data.get('top_k')
+    if top_k is None:
+        return None, None
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or not 1 <= top_k <= DIFFERENTIAL_MAX_TOP_K:
+        logger.warning("Invalid top_k: %s", top_k)
+        return None, f"'top_k' must be an integer between 1 and {DIFFERENTIAL_MAX_TOP_K}."
+    return top_k, None
+
+
+def _prediction_payload(symptoms, predicted_disease, recommendations):
+    with timed("predict.lookup"):
+        dis_des, precautions_list, medications_list, rec_diet, workout_list = lookup_recommendations(
+            recommendations, predicted_disease
+        )
+    return {
+        "detected_symptoms": symptoms,
+        "predicted_disease": predicted_disease,
+        "description": dis_des,
+        "precautions": precautions_list,
+        "medications": medications_list,
+        "diet": rec_diet,
+        "workout": workout_list
+    }
+
+
+def _predict_payloads(patients_symptoms, patients_unmapped, kb, top_k=None):
+    """Prediction payloads for many symptom lists; only uncached symptom sets reach the model.
+
+    With top_k, each payload also has a "differential": the top_k diseases
+    with their scores and recommendations, the predicted disease first.
+    """
+    with timed("predict.cache_lookup"):
+        keys = [prediction_key(symptoms, kb.version, top_k) for symptoms in patients_symptoms]
+        cached = [prediction_cache.get(key) for key in keys]
+    missing = {}
+    for key, symptoms, payload in zip(keys, patients_symptoms, cached):
+        if payload is None and key not in missing:
+            missing[key] = symptoms
+    if missing:
+        patients = list(missing.values())
+        if top_k:
+            rankings = kb.ranker.rank(patients, top_k)
+            predictions = [ranked[0]["disease"] for ranked in rankings]
+        else:
+            rankings = [None] * len(patients)
+            predictions = get_predicted_values(patients, kb.svc)
+        for key, predicted_disease, ranked in zip(missing, predictions, rankings):
+            payload = _prediction_payload(None, predicted_disease, kb.recommendations)
+            del payload["detected_symptoms"]
+            if ranked is not None:
+                payload["differential"] = ranked
+            prediction_cache.set(key, payload)
+            missing[key] = payload
+    return [
+        {"detected_symptoms": symptoms, "unmapped_symptoms": unmapped, **(payload or missing[key])}
+        for key, symptoms, unmapped, payload in zip(keys, patients_symptoms, patients_unmapped, cached)
+    ]
+
 @medical_bp.route('/test-predict-medicine', methods=['POST'])
 def main():
     try:
         data = request.get_json()
-        logger.info("Received data for test-predict-medicine: %s", data)
+        logger.info("Received data for test-predict-medicine: %s", data, extra=PAYLOAD)
 
         symptoms = data.get('symptoms')
 
@@ -18,18 +118,22 @@ def main():
             logger.warning("Invalid input format. 'symptoms' must be a list.")
             return jsonify({"error": "Invalid input format. 'symptoms' must be a list."}), 400
 
-        sym_des, precautions, workout, description, medications, diets = load_data()
-        svc = load_model()
+        symptoms, unmapped = symptom_vocabulary.resolve(symptoms)
+        if not symptoms:
+            logger.warning("None of the provided symptoms are recognised.")
+            return jsonify({"error": "None of the provided symptoms are recognised."}), 400
+        kb = get_knowledge_base()
 
-        predicted_disease = get_predicted_value(symptoms, svc)
-        logger.info("Predicted disease: %s", predicted_disease)
+        predicted_disease = get_predicted_value(symptoms, kb.svc)
+        logger.info("Predicted disease: %s", predicted_disease, extra=PAYLOAD)
 
-        dis_des, precautions_list, medications_list, rec_diet, workout_list = identification_helper(
-            predicted_disease, description, precautions, medications, diets, workout
+        dis_des, precautions_list, medications_list, rec_diet, workout_list = lookup_recommendations(
+            kb.recommendations, predicted_disease
         )
 
         return jsonify({
             "predicted_disease": predicted_disease,
+            "unmapped_symptoms": unmapped,
             "description": dis_des,
             "precautions": precautions_list[0] if precautions_list else [],
             "medications": medications_list,
@@ -46,60 +150,95 @@ def main():
 def predict_medicine_model():
     try:
         data = request.get_json()
-        logger.info("Received data for predict-medicine: %s", data)
+        logger.info("Received data for predict-medicine: %s", data, extra=PAYLOAD)
 
         # Validate input
         if not data:
             logger.warning("No input data provided.")
             return jsonify({"error": "No input data provided."}), 400
 
-        # Check if symptoms are provided directly or extract from text
-        if 'symptoms' in data and isinstance(data['symptoms'], list):
-            symptoms = data['symptoms']
-        elif 'text' in data and isinstance(data['text'], str):
-            text = data['text'].strip()
-            if not text:
-                logger.warning("Empty text provided.")
-                return jsonify({"error": "Empty text provided."}), 400
-            symptoms = extract_symptoms_from_text(text)
-            logger.info("Extracted symptoms from text: %s", symptoms)
-        else:
-            logger.warning("Invalid input. Provide either 'symptoms' as a list or 'text' as a string.")
-            return jsonify({
-                "error": "Invalid input. Provide either 'symptoms' as a list or 'text' as a string."
-            }), 400
+        symptoms, unmapped, error = _resolve_symptoms(data)
+        if error:
+            return jsonify({"error": error}), 400
+        top_k, error = _resolve_top_k(data)
+        if error:
+            return jsonify({"error": error}), 400
 
-        # Check if any symptoms were extracted
-        if not symptoms:
-            logger.warning("No symptoms detected in the provided input.")
-            return jsonify({"error": "No symptoms detected in the provided input."}), 400
+        # Warm model and supporting data shared across requests
+        kb = get_knowledge_base()
 
-        # Load supporting data
-        sym_des, precautions, workout, description, medications, diets = load_data()
+        # Predict disease, reusing the payload of an identical symptom set
+        payload = _predict_payloads([symptoms], [unmapped], kb, top_k)[0]
+        logger.info("Predicted disease: %s", payload["predicted_disease"], extra=PAYLOAD)
 
-        # Load model
-        svc = load_model()
+        # Send response with associated information
+        return jsonify(payload)
 
-        # Predict disease
-        predicted_disease = get_predicted_value(symptoms, svc)
-        logger.info("Predicted disease: %s", predicted_disease)
+    except Exception as e:
+        logger.error("Error in predict-medicine: %s", str(e))
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
-        # Get associated information
-        dis_des, precautions_list, medications_list, rec_diet, workout_list = identification_helper(
-            predicted_disease, description, precautions, medications, diets, workout
-        )
 
-        # Send response
+@medical_bp.route('/predict-medicine/batch', methods=['POST'])
+def predict_medicine_batch():
+    try:
+        data = request.get_json(silent=True)
+        patients = data.get('patients') if isinstance(data, dict) else None
+        if not patients or not isinstance(patients, list):
+            logger.warning("Invalid input. 'patients' must be a non-empty list.")
+            return jsonify({"error": "Invalid input. 'patients' must be a non-empty list."}), 400
+        if len(patients) > BATCH_PREDICT_MAX_PATIENTS:
+            logger.warning("Batch of %d patients exceeds limit of %d.", len(patients), BATCH_PREDICT_MAX_PATIENTS)
+            return jsonify({"error": f"At most {BATCH_PREDICT_MAX_PATIENTS} patients per batch."}), 400
+        top_k, error = _resolve_top_k(data)
+        if error:
+            return jsonify({"error": error}), 400
+        logger.info("Received batch of %d patients for predict-medicine.", len(patients))
+
+        # Resolve every patient first so valid ones can share a single predict call
+        results = [None] * len(patients)
+        valid_positions, valid_symptoms, valid_unmapped = [], [], []
+        for position, patient in enumerate(patients):
+            if not isinstance(patient, dict):
+                results[position] = {"error": "Each patient must be an object with 'symptoms' or 'text'."}
+                continue
+            symptoms, unmapped, error = _resolve_symptoms(patient)
+            if error:
+                results[position] = {"error": error}
+                continue
+            valid_positions.append(position)
+            valid_symptoms.append(symptoms)
+            valid_unmapped.append(unmapped)
+
+        kb = get_knowledge_base()
+        for position, payload in zip(valid_positions, _predict_payloads(valid_symptoms, valid_unmapped, kb, top_k)):
+            results[position] = payload
+
+        for position, (patient, result) in enumerate(zip(patients, results)):
+            result["index"] = position
+            if isinstance(patient, dict) and "id" in patient:
+                result["id"] = patient["id"]
+
         return jsonify({
-            "detected_symptoms": symptoms,
-            "predicted_disease": predicted_disease,
-            "description": dis_des,
-            "precautions": precautions_list,
-            "medications": medications_list,
-            "diet": rec_diet,
-            "workout": workout_list
+            "count": len(results),
+            "predicted": len(valid_positions),
+            "results": results
         })
 
     except Exception as e:
-        logger.error("Error in predict-medicine: %s", str(e))
-        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
\ No newline at end of file
+        logger.error("Error in predict-medicine batch: %s", str(e))
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+
+@medical_bp.route('/model-status', methods=['GET'])
+def model_status():
+    try:
+        return jsonify(get_registry().metrics()), 200
+    except Exception as e:
+        logger.error("Error in model-status: %s", str(e))
+        return jsonify({"error": str(e)}), 500
+
+
+@medical_bp.route('/prediction-cache-stats', methods=['GET'])
+def prediction_cache_stats():
+    return jsonify(prediction_cache.stats()), 200
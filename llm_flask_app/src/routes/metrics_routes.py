@@ -0,0 +1,54 @@
+import time
+from flask import Blueprint, Response, g, request
+from src.utils.metrics import (
+    observe, record_error, start_trace, current_trace, finish_trace, server_timing, render_prometheus
+)
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.before_app_request
+def start_request_timer():
+    g.metrics_trace = start_trace()
+    g.metrics_start = time.perf_counter()
+
+
+@metrics_bp.after_app_request
+def finish_request_timer(response):
+    if "metrics_trace" not in g:
+        return response
+    g.metrics_finished = True
+    stages = current_trace()
+    # Unmatched paths (404s) have no endpoint and are not worth a series each
+    if request.endpoint:
+        stage = f"request.{request.endpoint}"
+        # A streamed body (e.g. /process-content/stream) is produced after this hook
+        # returns, so only the setup would be timed; those views record their own
+        # total (stream_total) and stages run inside the generator are not traced.
+        if not response.is_streamed:
+            observe(stage, time.perf_counter() - g.pop("metrics_start"))
+        if response.status_code >= 500:
+            record_error(stage)
+    if stages:
+        # Per-request stage breakdown, shown by browser dev tools and most HTTP clients;
+        # for a streamed response it covers only the work done before the first byte
+        response.headers["Server-Timing"] = server_timing(stages)
+    return response
+
+
+@metrics_bp.teardown_app_request
+def end_request_trace(exc):
+    # Teardown runs even when an unhandled exception skipped the after-request hooks,
+    # so the trace is always reset and never collects the thread's next request
+    token = g.pop("metrics_trace", None)
+    if token is None:
+        return
+    if exc is not None and request.endpoint and not g.pop("metrics_finished", False):
+        record_error(f"request.{request.endpoint}")
+    finish_trace(token)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Per-stage latency histograms, p50/p95/p99 and error counts in Prometheus text format."""
+    return Response(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
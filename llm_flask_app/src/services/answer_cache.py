@@ -0,0 +1,167 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List
+from langchain_core.documents import Document
+from src.services.vector_store import chunk_id
+from src.services.redis_pool import get_redis_client
+from src.config import logger, ANSWER_CACHE_BACKEND, ANSWER_CACHE_TTL, ANSWER_CACHE_MAX_ENTRIES
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", question).strip().lower().rstrip("?.!").strip()
+
+
+def answer_cache_key(standalone_question: str, documents: List[Document], prompt_version: str) -> str:
+    """sha256 over prompt version, normalized standalone question and sorted chunk ids."""
+    digest = hashlib.sha256()
+    digest.update(prompt_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_question(standalone_question).encode("utf-8"))
+    for text_id in sorted(chunk_id(doc.page_content) for doc in documents):
+        digest.update(b"\0")
+        digest.update(text_id.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LocalAnswerCache:
+    """In-process answer cache with per-entry TTL and LRU eviction."""
+
+    backend = "local"
+
+    def __init__(self, max_entries: int = ANSWER_CACHE_MAX_ENTRIES, ttl: float = ANSWER_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["cached_at"] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry)
+
+    def set(self, key: str, answer: str):
+        with self._lock:
+            self._entries[key] = {"answer": answer, "cached_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+class RedisAnswerCache:
+    """Answer cache shared by all workers: SET with EX for TTL, a sorted set of
+    last-use times for LRU eviction beyond max_entries."""
+
+    backend = "redis"
+
+    def __init__(self, client, max_entries: int = ANSWER_CACHE_MAX_ENTRIES, ttl: float = ANSWER_CACHE_TTL,
+                 prefix: str = "answer_cache:"):
+        self.client = client
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefix = prefix
+        self.lru_key = f"{prefix}lru"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        raw = self.client.get(self.prefix + key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self.client.zadd(self.lru_key, {key: time.time()})
+        return json.loads(raw)
+
+    def set(self, key: str, answer: str):
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self.prefix + key, json.dumps({"answer": answer, "cached_at": now}), ex=int(self.ttl))
+        pipe.zadd(self.lru_key, {key: now})
+        pipe.zremrangebyscore(self.lru_key, 0, now - self.ttl)  # already expired by TTL
+        pipe.zcard(self.lru_key)
+        excess = pipe.execute()[-1] - self.max_entries
+        if excess > 0:
+            oldest = [k.decode() if isinstance(k, bytes) else k for k in self.client.zrange(self.lru_key, 0, excess - 1)]
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(*[self.prefix + k for k in oldest])
+            pipe.zrem(self.lru_key, *oldest)
+            pipe.execute()
+            with self._lock:
+                self.evictions += len(oldest)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            counters = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+        return {
+            "backend": self.backend,
+            **counters,
+            "entries": self.client.zcard(self.lru_key),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+        }
+
+
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """Process-wide answer cache per ANSWER_CACHE_BACKEND, or None when it is "off"."""
+    global _answer_cache
+    if _answer_cache is None and ANSWER_CACHE_BACKEND != "off":
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                logger.info(f"Using {ANSWER_CACHE_BACKEND} answer cache")
+                if ANSWER_CACHE_BACKEND == "redis":
+                    _answer_cache = RedisAnswerCache(get_redis_client())
+                else:
+                    _answer_cache = LocalAnswerCache()
+    return _answer_cache
+
+
+def set_answer_cache(cache):
+    """Replace the process-wide answer cache, e.g. with a RedisAnswerCache over fakeredis."""
+    global _answer_cache
+    with _answer_cache_lock:
+        _answer_cache = cache
@@ -1,61 +1,150 @@
-from typing import List, Union
-from langchain_community.document_loaders import PyPDFLoader, WebBaseLoader, TextLoader
+import hashlib
+import os
+import uuid
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Union
+from pathlib import Path
+from werkzeug.utils import secure_filename
 from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from src.config import logger
+from src.utils.logger import PAYLOAD
+from src.config import (
+    logger,
+    UPLOAD_DIR,
+    CHUNK_SETTINGS,
+    DEFAULT_CHUNK_SETTINGS,
+    TEXT_BLOCK_CHARS,
+    INGESTION_BATCH_SIZE,
+)
 
-def load_content(source: Union[str, List[str]], source_type: str) -> List[Document]:
+
+def _iter_text_file(path: str, block_chars: int = TEXT_BLOCK_CHARS) -> Iterator[Document]:
+    """Read a text file in blocks that end on a paragraph (or line) break."""
+    with open(path) as f:
+        carry = ""
+        while block := f.read(block_chars):
+            text = carry + block
+            cut = text.rfind("\n\n")
+            if cut <= 0:
+                cut = text.rfind("\n")
+            if cut <= 0:
+                cut = len(text)
+            carry = text[cut:]
+            yield Document(page_content=text[:cut], metadata={"source": path})
+        if carry:
+            yield Document(page_content=carry, metadata={"source": path})
+
+
+def source_label(source, source_type: str | None) -> str:
+    """Source as it appears in logs: paths and URLs as given, raw text only as its length."""
+    if source_type == "raw":
+        texts = [source] if isinstance(source, str) else source or []
+        return f"raw text ({sum(len(text) for text in texts)} chars)"
+    return str(source)
+
+
+def lazy_load_content(source: Union[str, List[str]], source_type: str) -> Iterator[Document]:
+    """Yield source Documents one at a time (PDF pages, web pages, text blocks)."""
     try:
-        logger.info(f"Loading content from {source_type}: {source}")
+        logger.info("Loading content from %s: %s", source_type, source_label(source, source_type))
         sources = [source] if isinstance(source, str) else source
         if not isinstance(sources, list):
             logger.error("Source must be a string or list of strings")
             raise ValueError("Source must be a string or list of strings")
-        
-        documents = []
+
+        # The PDF and web loaders (pypdf, requests, BeautifulSoup) are imported on first use
         if source_type == "pdf":
-            for src in sources:
-                logger.info(f"Loading PDF from: {src}")
-                loader = PyPDFLoader(src)
-                loaded_docs = loader.load()
-                if not loaded_docs:
-                    logger.warning(f"No documents loaded from {src}")
-                documents.extend(loaded_docs)
+            from src.services.pdf_loader import iter_pdf_documents
+            logger.info("Loading PDF from: %s", sources)
+            yield from iter_pdf_documents(sources)
         elif source_type == "web":
-            logger.info(f"Loading web content from: {sources}")
-            loader = WebBaseLoader(sources)
-            documents.extend(loader.load())
+            from src.services.web_loader import load_web_documents
+            logger.info("Loading web content from: %s", sources)
+            yield from load_web_documents(sources)
         elif source_type == "text":
             for src in sources:
-                logger.info(f"Loading text from: {src}")
-                loader = TextLoader(src)
-                documents.extend(loader.load())
+                logger.info("Loading text from: %s", src)
+                yield from _iter_text_file(src)
         elif source_type == "raw":
             for src in sources:
-                logger.info(f"Processing raw content: {src}")
-                documents.append(
-                    Document(page_content=src, metadata={"source": "raw_input"})
-                )
+                logger.info("Processing raw content: %s chars", len(src))
+                logger.info("Raw content preview: %.200s", src, extra=PAYLOAD)
+                yield Document(page_content=src, metadata={"source": "raw_input"})
         else:
             logger.error(f"Unsupported source type: {source_type}")
             raise ValueError(f"Unsupported source type: {source_type}")
-        
-        logger.info(f"Loaded {len(documents)} documents from {source_type} source(s)")
-        return documents
 
     except Exception as e:
         logger.error(f"Error loading content: {str(e)}")
         raise Exception(f"Error loading content: {e}")
-    
-def get_text_chunks(documents: List[Document]) -> List[str]:
+
+
+@lru_cache(maxsize=None)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def iter_text_chunks(documents: Iterable[Document], source_type: str | None = None) -> Iterator[Document]:
+    """Split documents as they arrive; each chunk keeps its document's metadata (source, page)."""
+    chunk_size, chunk_overlap = CHUNK_SETTINGS.get(source_type, DEFAULT_CHUNK_SETTINGS)
+    splitter = _get_splitter(chunk_size, chunk_overlap)
     try:
-        logger.info(f"Splitting {len(documents)} documents into chunks")
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=1000)
-        chunks = text_splitter.split_documents(documents)
-        logger.info(f"Created {len(chunks)} text chunks")
-        return [chunk.page_content for chunk in chunks]
+        for document in documents:
+            yield from splitter.split_documents([document])
     except Exception as e:
         logger.error(f"Error splitting documents: {str(e)}")
         raise Exception(f"Error splitting documents: {e}")
 
 
+def iter_chunk_batches(chunks: Iterable[Document], batch_size: int = INGESTION_BATCH_SIZE) -> Iterator[List[Document]]:
+    """Group chunks into lists of batch_size for embedding."""
+    chunks = iter(chunks)
+    while batch := list(islice(chunks, batch_size)):
+        yield batch
+
+
+def save_uploaded_file(file, username: str) -> Path:
+    """Store an uploaded file under data/<username>/ named by its content hash.
+
+    The upload is hashed while it is written to a temporary file; when a file
+    with the same content and name is already stored, that one is returned
+    and nothing new is kept.
+    """
+    filename = secure_filename(file.filename)
+    user_dir = Path(UPLOAD_DIR) / username
+    user_dir.mkdir(exist_ok=True, parents=True)
+    digest = hashlib.sha256()
+    tmp_path = user_dir / f".upload-{uuid.uuid4().hex}"
+    with open(tmp_path, "wb") as f:
+        while block := file.stream.read(1 << 20):
+            digest.update(block)
+            f.write(block)
+    source = user_dir / f"{digest.hexdigest()[:16]}_{filename}"
+    if source.exists():
+        tmp_path.unlink()
+        logger.info("Upload already stored: %s", source)
+    else:
+        os.replace(tmp_path, source)
+        logger.info("File saved: %s", source)
+    return source
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def upload_source_key(filename: str, source_id: str | None = None) -> str:
+    """Manifest key for an upload; the manifest is per user, so this is user + name.
+
+    Re-uploading a file under the same name replaces the chunks of its
+    previous version. Clients that upload different documents under one name
+    can send a source_id to keep them apart.
+    """
+    if source_id:
+        return f"upload:id:{source_id}"
+    return f"upload:{secure_filename(filename)}"
@@ -0,0 +1,160 @@
+import os
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from typing import List
+from langchain_core.embeddings import Embeddings
+from src.services.llm_processor import get_embeddings
+from src.config import logger, EMBEDDING_MODEL, EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+
+
+def embedding_key(text: str, model_name: str) -> str:
+    """Content address of a chunk embedding: sha256 over model name and text."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """Wrap an embeddings client with a size-bounded SQLite cache for documents.
+
+    Only ``embed_documents`` is cached; queries are embedded once per question
+    and passed straight through. Vectors are stored as float32, the precision
+    FAISS keeps anyway. When the cache grows past ``max_entries`` the least
+    recently used rows are deleted.
+
+    With ``embeddings=None`` the client is looked up with get_embeddings() on
+    every call, so llm_processor.set_embeddings() takes effect immediately.
+    """
+
+    def __init__(self, embeddings: Embeddings | None, model_name: str, path: str, max_entries: int):
+        self._embeddings = embeddings
+        self.model_name = model_name
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embeddings if self._embeddings is not None else get_embeddings()
+
+    def _fetch(self, keys: List[str]) -> dict:
+        found = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), _SQL_BATCH):
+                batch = keys[i:i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                found.update(rows)
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})", [now] + batch
+                )
+            self._conn.commit()
+        return {key: array("f", blob).tolist() for key, blob in found.items()}
+
+    def _store(self, items: dict):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, array("f", vector).tobytes(), now) for key, vector in items.items()],
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+            self._conn.commit()
+        if excess > 0:
+            logger.info(f"Evicted {excess} embeddings from cache")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [embedding_key(text, self.model_name) for text in texts]
+        cached = self._fetch(list(set(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        hit_count = sum(1 for key in keys if key in cached)
+        with self._lock:
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+        logger.info(f"Embedding cache: {len(texts) - len(missing)} cached, {len(missing)} to embed")
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            cached.update(computed)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "max_entries": self.max_entries,
+            }
+
+
+_cached_embeddings = None
+_cached_embeddings_lock = threading.Lock()
+
+
+def get_cached_embeddings() -> CachedEmbeddings:
+    """Process-wide embeddings client backed by the on-disk chunk cache."""
+    global _cached_embeddings
+    if _cached_embeddings is None:
+        with _cached_embeddings_lock:
+            if _cached_embeddings is None:
+                logger.info(f"Opening embedding cache at {EMBEDDING_CACHE_PATH}")
+                _cached_embeddings = CachedEmbeddings(
+                    None, EMBEDDING_MODEL, EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES
+                )
+    return _cached_embeddings
+
+
+def set_cached_embeddings(cached_embeddings: CachedEmbeddings | None):
+    """Replace the process-wide embedding cache, e.g. with one in a temp directory; None reopens the default."""
+    global _cached_embeddings
+    with _cached_embeddings_lock:
+        _cached_embeddings = cached_embeddings
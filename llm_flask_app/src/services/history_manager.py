@@ -2,36 +2,61 @@ import json
 import pandas as pd
 from typing import List
 from langchain_community.chat_message_histories import RedisChatMessageHistory, ChatMessageHistory
-from langchain_core.messages import HumanMessage, AIMessage
-from src.config import REDIS_HISTORY_URL, logger
+from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from src.services.redis_pool import get_redis_history, get_async_redis_client
+from src.config import CHAT_HISTORY_MAX_MESSAGES, logger
+from src.utils.logger import PAYLOAD
+from src.utils.metrics import timed, traced
 
 
+def _push_messages(redis_history: RedisChatMessageHistory, messages: List[BaseMessage],
+                   max_length: int | None = None, replace: bool = False):
+    """Write messages in one pipelined MULTI/EXEC round trip.
+
+    Uses the same layout as RedisChatMessageHistory.add_message (LPUSH of JSON,
+    newest first) so ``redis_history.messages`` reads the result unchanged.
+    """
+    key = redis_history.key
+    pipe = redis_history.redis_client.pipeline(transaction=True)
+    if replace:
+        pipe.delete(key)
+    for msg in messages:
+        pipe.lpush(key, json.dumps(message_to_dict(msg)))
+    if max_length:
+        # Newest messages sit at the head of the list
+        pipe.ltrim(key, 0, max_length - 1)
+    if redis_history.ttl:
+        pipe.expire(key, redis_history.ttl)
+    pipe.execute()
+
+
+def _conversation_messages(conversation_entry: tuple) -> List[BaseMessage]:
+    # Store question as HumanMessage, answer as AIMessage with metadata
+    question, answer, timestamp, source, source_type = conversation_entry
+    return [
+        HumanMessage(content=question),
+        AIMessage(
+            content=answer,
+            additional_kwargs={
+                "timestamp": timestamp,
+                "source": source,
+                "source_type": source_type
+            }
+        ),
+    ]
+
+
+@traced("history.save_conversation")
 def save_conversation_to_redis(user_id: str, conversation_entry: tuple):
     """Save a conversation entry to Redis for a specific user."""
     try:
         # Use a user-specific session_id
         session_id = f"conversation_history:{user_id}"
-        redis_history = RedisChatMessageHistory(
-            session_id=session_id, url=REDIS_HISTORY_URL
-        )
-        
-        # Unpack the tuple
-        question, answer, timestamp, source, source_type = conversation_entry
+        redis_history = get_redis_history(session_id)
         
-        # Store question as HumanMessage, answer as AIMessage with metadata
-        redis_history.add_message(HumanMessage(content=question))
-        redis_history.add_message(
-            AIMessage(
-                content=answer,
-                additional_kwargs={
-                    "timestamp": timestamp,
-                    "source": source,
-                    "source_type": source_type
-                }
-            )
-        )
+        _push_messages(redis_history, _conversation_messages(conversation_entry))
         
-        logger.info(f"Conversation entry saved to Redis for user {user_id}: {question}")
+        logger.info("Conversation entry saved to Redis for user %s: %s", user_id, conversation_entry[0], extra=PAYLOAD)
     except Exception as e:
         logger.error(f"Error saving to Redis for user {user_id}: {str(e)}")
         raise Exception(f"Error saving to Redis: {e}")
@@ -41,9 +66,7 @@ def get_conversation_history_from_redis(user_id: str) -> List[tuple]:
     """Retrieve conversation history for a specific user from Redis."""
     try:
         session_id = f"conversation_history:{user_id}"
-        redis_history = RedisChatMessageHistory(
-            session_id=session_id, url=REDIS_HISTORY_URL
-        )
+        redis_history = get_redis_history(session_id)
         
         logger.info(f"Retrieving conversation history for user {user_id} from Redis.")
         messages = redis_history.messages
@@ -79,9 +102,7 @@ def clear_conversation_history_in_redis(user_id: str = None):
         if user_id:
             # Clear user-specific conversation history
             session_id = f"conversation_history:{user_id}"
-            user_history = RedisChatMessageHistory(
-                session_id=session_id, url=REDIS_HISTORY_URL
-            )
+            user_history = get_redis_history(session_id)
             user_history.clear()
             logger.info(f"Cleared conversation history for user {user_id}")
             return f"Conversation history reset for user {user_id} in Redis."
@@ -119,13 +140,12 @@ def save_history_to_csv(user_id: str, filename: str = None):
         raise
 
 
+@traced("history.load")
 def get_session_chat_history(user_id: str) -> ChatMessageHistory:
     """Retrieve or initialize chat history for a user."""
     try:
         session_id = f"chat_history:{user_id}"
-        redis_history = RedisChatMessageHistory(
-            session_id=session_id, url=REDIS_HISTORY_URL
-        )
+        redis_history = get_redis_history(session_id)
         
         chat_history = ChatMessageHistory()
         messages = redis_history.messages
@@ -146,22 +166,74 @@ def get_session_chat_history(user_id: str) -> ChatMessageHistory:
 
 
 def save_session_chat_history(user_id: str, chat_history: ChatMessageHistory):
-    """Save chat history to Redis for a user."""
+    """Replace the stored chat history for a user with chat_history, atomically."""
     try:
         session_id = f"chat_history:{user_id}"
-        redis_history = RedisChatMessageHistory(
-            session_id=session_id, url=REDIS_HISTORY_URL
-        )
+        redis_history = get_redis_history(session_id)
         
         if not chat_history.messages:
             logger.info(f"No messages to save for user {user_id}")
             return
         
-        redis_history.clear()  # Clear existing history
-        for msg in chat_history.messages:
-            redis_history.add_message(msg)
+        # DELETE and re-push inside one MULTI so readers never see an empty history
+        _push_messages(redis_history, chat_history.messages, replace=True)
         
         logger.info(f"Saved {len(chat_history.messages)} messages for user {user_id}")
     except Exception as e:
         logger.error(f"Error saving chat history for {user_id}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+@traced("history.save_chat")
+def append_session_chat_history(user_id: str, messages: List[BaseMessage],
+                                max_length: int | None = CHAT_HISTORY_MAX_MESSAGES):
+    """Append only the new messages of a turn, optionally trimming to max_length."""
+    try:
+        if not messages:
+            logger.info(f"No messages to append for user {user_id}")
+            return
+        session_id = f"chat_history:{user_id}"
+        redis_history = get_redis_history(session_id)
+        _push_messages(redis_history, messages, max_length=max_length)
+        logger.info(f"Appended {len(messages)} messages for user {user_id}")
+    except Exception as e:
+        logger.error(f"Error appending chat history for {user_id}: {str(e)}")
+        raise
+
+
+# Async counterparts for the ASGI request path. Keys and encoding match
+# RedisChatMessageHistory, so sync and async readers see the same history.
+_KEY_PREFIX = "message_store:"
+
+
+async def aget_session_chat_history(user_id: str) -> List[BaseMessage]:
+    """Chat history messages for a user, oldest first, read with the async client."""
+    try:
+        with timed("history.load"):
+            items = await get_async_redis_client().lrange(f"{_KEY_PREFIX}chat_history:{user_id}", 0, -1)
+        messages = messages_from_dict([json.loads(item) for item in items[::-1]])
+        logger.info(f"Loaded {len(messages)} messages for user {user_id}")
+        return messages
+    except Exception as e:
+        logger.error(f"Error loading chat history for {user_id}: {str(e)}")
+        raise
+
+
+async def asave_turn(user_id: str, messages: List[BaseMessage], conversation_entry: tuple,
+                     max_length: int | None = CHAT_HISTORY_MAX_MESSAGES):
+    """Append a turn to the chat history and the conversation log in one MULTI/EXEC."""
+    try:
+        chat_key = f"{_KEY_PREFIX}chat_history:{user_id}"
+        pipe = get_async_redis_client().pipeline(transaction=True)
+        for msg in messages:
+            pipe.lpush(chat_key, json.dumps(message_to_dict(msg)))
+        if max_length:
+            pipe.ltrim(chat_key, 0, max_length - 1)
+        for msg in _conversation_messages(conversation_entry):
+            pipe.lpush(f"{_KEY_PREFIX}conversation_history:{user_id}", json.dumps(message_to_dict(msg)))
+        with timed("history.save_turn"):
+            await pipe.execute()
+        logger.info(f"Saved turn for user {user_id}")
+    except Exception as e:
+        logger.error(f"Error saving turn for {user_id}: {str(e)}")
+        raise Exception(f"Error saving to Redis: {e}")
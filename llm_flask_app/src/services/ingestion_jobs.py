@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from src.services.redis_pool import get_redis_client
+from src.services.source_indexer import index_sources
+from src.config import (
+    logger,
+    INGESTION_WORKERS,
+    INGESTION_MAX_JOBS,
+    INGESTION_JOB_TTL,
+    INGESTION_CHECKPOINT_SECONDS,
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Job records live in Redis so a status poll reaching any worker finds them:
+# one hash per job (each field JSON-encoded) plus a sorted set of a user's job
+# ids by creation time. Both expire INGESTION_JOB_TTL seconds after the last update.
+JOB_KEY = "ingestion_job:"
+USER_JOBS_KEY = "ingestion_jobs:"
+
+_executor = ThreadPoolExecutor(max_workers=INGESTION_WORKERS, thread_name_prefix="ingest")
+# Jobs submitted by this process that have not started yet
+_queued = set()
+_queued_lock = threading.Lock()
+
+
+def _update(job_id: str, **fields):
+    key = JOB_KEY + job_id
+    pipe = get_redis_client().pipeline(transaction=False)
+    pipe.hset(key, mapping={field: json.dumps(value) for field, value in fields.items()})
+    pipe.expire(key, INGESTION_JOB_TTL)
+    pipe.execute()
+
+
+def _decode(raw: dict) -> dict | None:
+    if not raw:
+        return None
+    return {
+        (field.decode() if isinstance(field, bytes) else field): json.loads(value)
+        for field, value in raw.items()
+    }
+
+
+def _run_job(job_id: str, username: str, source, source_type: str, source_key: str | None):
+    with _queued_lock:
+        _queued.discard(job_id)
+    _update(job_id, status=RUNNING, stage="indexing", started_at=time.time())
+    try:
+        logger.info(f"Ingestion job {job_id}: indexing {source_type} source for {username}")
+        # Loading, chunking and embedding are interleaved, so the chunk total is only known at
+        # the end; progress is the share of the source read (pages, bytes or documents)
+        # Each batch is searchable in memory as soon as it is embedded; other
+        # workers see the index on disk at the next checkpoint
+        _, report = index_sources(
+            username,
+            source,
+            source_type,
+            source_key=source_key,
+            checkpoint_seconds=INGESTION_CHECKPOINT_SECONDS,
+            on_batch=lambda done, fraction: _update(job_id, chunks_indexed=done, progress=round(fraction, 4)),
+        )
+        if not report["chunks_total"]:
+            raise ValueError("No text chunks created from the source.")
+
+        _update(
+            job_id,
+            status=COMPLETED,
+            stage="done",
+            progress=1.0,
+            indexing=report,
+            finished_at=time.time(),
+        )
+        logger.info(f"Ingestion job {job_id} completed: {report['chunks_total']} chunks for {username}")
+    except Exception as e:
+        logger.error(f"Ingestion job {job_id} failed: {str(e)}")
+        _update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+
+
+def submit_ingestion_job(username: str, source, source_type: str, source_key: str | None = None) -> dict:
+    """Queue load -> chunk -> embed -> index for a source and return the job record."""
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "username": username,
+        # Raw text can be megabytes; don't echo it back in every status response
+        "source": "raw_input" if source_type == "raw" else source,
+        "source_type": source_type,
+        "status": QUEUED,
+        "stage": "queued",
+        "progress": 0.0,
+        "chunks_indexed": 0,
+        "indexing": None,
+        "error": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+    user_key = USER_JOBS_KEY + username
+    pipe = get_redis_client().pipeline(transaction=False)
+    pipe.hset(JOB_KEY + job_id, mapping={field: json.dumps(value) for field, value in job.items()})
+    pipe.expire(JOB_KEY + job_id, INGESTION_JOB_TTL)
+    pipe.zadd(user_key, {job_id: job["created_at"]})
+    # Only the newest INGESTION_MAX_JOBS are listed; older records still expire on their own
+    pipe.zremrangebyrank(user_key, 0, -INGESTION_MAX_JOBS - 1)
+    pipe.expire(user_key, INGESTION_JOB_TTL)
+    pipe.execute()
+    with _queued_lock:
+        _queued.add(job_id)
+    _executor.submit(_run_job, job_id, username, source, source_type, source_key)
+    logger.info(f"Queued ingestion job {job_id} for {username}")
+    return job
+
+
+def get_job(job_id: str) -> dict | None:
+    return _decode(get_redis_client().hgetall(JOB_KEY + job_id))
+
+
+def list_jobs(username: str) -> list:
+    client = get_redis_client()
+    user_key = USER_JOBS_KEY + username
+    job_ids = client.zrange(user_key, 0, -1)
+    pipe = client.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hgetall(JOB_KEY + (job_id.decode() if isinstance(job_id, bytes) else job_id))
+    jobs = [_decode(raw) for raw in pipe.execute()]
+    expired = [job_id for job_id, job in zip(job_ids, jobs) if job is None]
+    if expired:
+        client.zrem(user_key, *expired)
+    return [job for job in jobs if job is not None]
+
+
+def shutdown_ingestion_jobs():
+    """Drop this worker's queued jobs and wait for its running ones; used when a server worker exits."""
+    with _queued_lock:
+        queued = list(_queued)
+        _queued.clear()
+    for job_id in queued:
+        _update(job_id, status=FAILED, error="Server shutting down", finished_at=time.time())
+    if queued:
+        logger.warning(f"Cancelling {len(queued)} queued ingestion jobs on shutdown")
+    _executor.shutdown(wait=True, cancel_futures=True)
@@ -1,83 +1,142 @@
 from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.chains import create_history_aware_retriever, create_retrieval_chain
+from langchain_core.output_parsers import StrOutputParser
 from langchain.chains.combine_documents import create_stuff_documents_chain
-from src.config import logger
+from src.config import logger, EMBEDDING_MODEL
+import hashlib
+import threading
 import os
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-def get_embeddings():
-    try:
-        logger.info("Initializing embeddings model.")
-        embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001", google_api_key=GOOGLE_API_KEY
-        )
-        logger.info("Embeddings model initialized.")
-        return embeddings
-    except Exception as e:
-        logger.error(f"Failed to initialize embeddings: {str(e)}")
-        raise
+# Contextualize question prompt
+# Continuation-line indentation is part of the prompt text, as originally sent to the model
+contextualize_q_system_prompt = """Given a chat history and the latest user question \
+                which might reference context in the chat history, formulate a standalone question \
+                which can be understood without the chat history. Do NOT answer the question, \
+                just reformulate it if needed and otherwise return it as is."""
+CONTEXTUALIZE_Q_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", contextualize_q_system_prompt),
+        MessagesPlaceholder("chat_history"),
+        ("human", "{input}"),
+    ]
+)
+
+# QA prompt with chat history for medical assistance
+qa_system_prompt = """You are a medical assistant specialized in providing health-related information. \
+        Use the following pieces of retrieved context to answer the user's medical question. \
+        Ensure that your response is accurate, concise, and limited to three sentences. \
+        If you are unsure about the answer or if the information is not available, clearly state that you do not know. \
+        Always prioritize the user's health and safety in your responses.\n\n{context}"""
+QA_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", qa_system_prompt),
+        MessagesPlaceholder("chat_history"),
+        ("human", "{input}"),
+    ]
+)
+
+# Part of every answer cache key, so editing either prompt invalidates cached answers
+PROMPT_VERSION = hashlib.sha256(
+    (contextualize_q_system_prompt + "\0" + qa_system_prompt).encode("utf-8")
+).hexdigest()[:16]
 
+# One client of each kind per process; both are safe to share across threads
+_clients_lock = threading.Lock()
+_embeddings = None
+_chat_model = None
+_question_answer_chain = None
+_standalone_question_chain = None
+
+
+def get_embeddings():
+    global _embeddings
+    if _embeddings is None:
+        with _clients_lock:
+            if _embeddings is None:
+                try:
+                    logger.info("Initializing embeddings model.")
+                    _embeddings = GoogleGenerativeAIEmbeddings(
+                        model=EMBEDDING_MODEL, google_api_key=GOOGLE_API_KEY
+                    )
+                    logger.info("Embeddings model initialized.")
+                except Exception as e:
+                    logger.error(f"Failed to initialize embeddings: {str(e)}")
+                    raise
+    return _embeddings
 
 
 def get_chat_model():
+    global _chat_model
+    if _chat_model is None:
+        with _clients_lock:
+            if _chat_model is None:
+                try:
+                    logger.info("Initializing chat model.")
+                    _chat_model = ChatGoogleGenerativeAI(
+                        model="gemini-1.5-flash", temperature=0.3, google_api_key=GOOGLE_API_KEY
+                    )
+                    logger.info("Chat model initialized.")
+                except Exception as e:
+                    logger.error(f"Failed to initialize chat model: {str(e)}")
+                    raise
+    return _chat_model
+
+
+def set_chat_model(model):
+    """Replace the process-wide chat model, e.g. with a fake for benchmarks."""
+    global _chat_model, _question_answer_chain, _standalone_question_chain
+    with _clients_lock:
+        _chat_model = model
+        _question_answer_chain = None
+        _standalone_question_chain = None
+
+
+def set_embeddings(embeddings):
+    """Replace the process-wide embeddings client, e.g. with a fake for benchmarks."""
+    global _embeddings
+    with _clients_lock:
+        _embeddings = embeddings
+
+
+def warm_up_llm_clients():
+    """Build the LLM clients and prompt chains now so the first request does not pay for it.
+
+    Called in each server worker after fork: the Google clients open gRPC
+    channels, which must not be created in a parent and used in a child.
+    """
     try:
-        logger.info("Initializing chat model.")
-        model = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash", temperature=0.3, google_api_key=GOOGLE_API_KEY
-        )
-        logger.info("Chat model initialized.")
-        return model
+        get_embeddings()
+        get_question_answer_chain()
+        get_standalone_question_chain()
     except Exception as e:
-        logger.error(f"Failed to initialize chat model: {str(e)}")
-        raise
+        logger.error(f"LLM client warm-up failed: {str(e)}")
 
 
-def get_conversational_chain(retriever):
-    """Create a conversational chain with chat history support."""
-    try:
-        logger.info("Creating conversational chain with history support.")
+def get_question_answer_chain():
+    """Stuff-documents QA chain; it does not depend on the retriever so it is built once."""
+    global _question_answer_chain
+    chain = _question_answer_chain
+    if chain is None:
         model = get_chat_model()
+        with _clients_lock:
+            if _question_answer_chain is None:
+                _question_answer_chain = create_stuff_documents_chain(model, QA_PROMPT)
+                logger.info("Question-answer chain created.")
+            chain = _question_answer_chain
+    return chain
 
-            # Contextualize question prompt
-        contextualize_q_system_prompt = """Given a chat history and the latest user question \
-                which might reference context in the chat history, formulate a standalone question \
-                which can be understood without the chat history. Do NOT answer the question, \
-                just reformulate it if needed and otherwise return it as is."""
-        contextualize_q_prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", contextualize_q_system_prompt),
-                MessagesPlaceholder("chat_history"),
-                ("human", "{input}"),
-            ]
-        )
-        history_aware_retriever = create_history_aware_retriever(
-            model, retriever, contextualize_q_prompt
-        )
-        logger.info("History-aware retriever created.")
-
-        # QA prompt with chat history for medical assistance
-        qa_system_prompt = """You are a medical assistant specialized in providing health-related information. \
-        Use the following pieces of retrieved context to answer the user's medical question. \
-        Ensure that your response is accurate, concise, and limited to three sentences. \
-        If you are unsure about the answer or if the information is not available, clearly state that you do not know. \
-        Always prioritize the user's health and safety in your responses.\n\n{context}"""
 
-        qa_prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", qa_system_prompt),
-                MessagesPlaceholder("chat_history"),
-                ("human", "{input}"),
-            ]
-        )
-        question_answer_chain = create_stuff_documents_chain(model, qa_prompt)
-        logger.info("Question-answer chain created.")
-
-        # Full retrieval chain
-        chain = create_retrieval_chain(history_aware_retriever, question_answer_chain)
-        logger.info("Conversational chain created.")
-        return chain
-    except Exception as e:
-        logger.error(f"Failed to create conversational chain: {str(e)}")
-        raise
+def get_standalone_question_chain():
+    """Chat history + latest question -> standalone question (the history-aware retriever's first step)."""
+    global _standalone_question_chain
+    chain = _standalone_question_chain
+    if chain is None:
+        model = get_chat_model()
+        with _clients_lock:
+            if _standalone_question_chain is None:
+                _standalone_question_chain = CONTEXTUALIZE_Q_PROMPT | model | StrOutputParser()
+                logger.info("Standalone question chain created.")
+            chain = _standalone_question_chain
+    return chain
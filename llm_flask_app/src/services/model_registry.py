@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from src.services.recommedmedicine import (
+    load_data, load_model, DiseaseRanker, TRAINING_DATA_DIR, MODEL_PATH, DATA_FILES
+)
+from src.services.recommendation_index import build_recommendation_index
+from src.utils.metrics import traced
+from src.config import logger, MODEL_RELOAD_CHECK_INTERVAL
+
+
+KnowledgeBase = namedtuple(
+    "KnowledgeBase",
+    [
+        "svc", "sym_des", "precautions", "workout", "description", "medications", "diets",
+        "recommendations", "ranker", "version", "fingerprint",
+    ],
+)
+
+
+def _watched_files():
+    return [MODEL_PATH] + [os.path.join(TRAINING_DATA_DIR, name) for name in DATA_FILES]
+
+
+def _fingerprint():
+    """Return (path, mtime_ns, size) for every file the knowledge base is built from."""
+    stamp = []
+    for path in _watched_files():
+        try:
+            stat = os.stat(path)
+            stamp.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stamp.append((path, None, None))
+    return tuple(stamp)
+
+
+class ModelRegistry:
+    """Keeps one warm copy of the SVC model and the recommendation tables per process.
+
+    Readers get an immutable ``KnowledgeBase`` snapshot that must be treated as
+    read-only. When the files on disk change, a complete new snapshot is built
+    and swapped in with a single reference assignment, so a request never sees
+    a half-loaded model.
+    """
+
+    def __init__(self, check_interval: float = MODEL_RELOAD_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._metrics = {
+            "loads": 0,
+            "reload_errors": 0,
+            "last_load_seconds": None,
+            "total_load_seconds": 0.0,
+            "last_loaded_at": None,
+            "model_file_bytes": 0,
+            "tables_bytes": {},
+        }
+
+    def get(self) -> KnowledgeBase:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self._load(force=True)
+        now = time.monotonic()
+        if self.check_interval is not None and now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if _fingerprint() != snapshot.fingerprint:
+                return self._load(force=False)
+        return snapshot
+
+    def reload(self) -> KnowledgeBase:
+        return self._load(force=True)
+
+    def _load(self, force: bool) -> KnowledgeBase:
+        with self._lock:
+            current = self._snapshot
+            fingerprint = _fingerprint()
+            # Another thread may have finished the reload while we were waiting.
+            if not force and current is not None and current.fingerprint == fingerprint:
+                return current
+
+            logger.info("Loading model and knowledge base into registry.")
+            start = time.perf_counter()
+            try:
+                sym_des, precautions, workout, description, medications, diets = load_data()
+                svc = load_model()
+                recommendations = build_recommendation_index(
+                    description, precautions, medications, diets, workout
+                )
+                ranker = DiseaseRanker(svc, recommendations)
+            except Exception as e:
+                self._metrics["reload_errors"] += 1
+                if current is None:
+                    logger.error(f"Failed to load model registry: {str(e)}")
+                    raise
+                logger.error(f"Failed to reload model registry, keeping version {current.version}: {str(e)}")
+                return current
+            elapsed = time.perf_counter() - start
+
+            snapshot = KnowledgeBase(
+                svc=svc,
+                sym_des=sym_des,
+                precautions=precautions,
+                workout=workout,
+                description=description,
+                medications=medications,
+                diets=diets,
+                recommendations=recommendations,
+                ranker=ranker,
+                version=(current.version + 1) if current else 1,
+                fingerprint=fingerprint,
+            )
+            self._record_load(snapshot, elapsed)
+            self._snapshot = snapshot
+            self._last_check = time.monotonic()
+            logger.info(f"Model registry version {snapshot.version} loaded in {elapsed:.3f}s")
+            return snapshot
+
+    def _record_load(self, snapshot: KnowledgeBase, elapsed: float):
+        tables = {
+            "sym_des": snapshot.sym_des,
+            "precautions": snapshot.precautions,
+            "workout": snapshot.workout,
+            "description": snapshot.description,
+            "medications": snapshot.medications,
+            "diets": snapshot.diets,
+        }
+        self._metrics["loads"] += 1
+        self._metrics["last_load_seconds"] = round(elapsed, 6)
+        self._metrics["total_load_seconds"] = round(self._metrics["total_load_seconds"] + elapsed, 6)
+        self._metrics["last_loaded_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        # Size of the pickle on disk; the fitted SVC's in-memory footprint is not measured.
+        self._metrics["model_file_bytes"] = os.path.getsize(MODEL_PATH)
+        self._metrics["tables_bytes"] = {
+            name: int(df.memory_usage(deep=True).sum()) for name, df in tables.items()
+        }
+
+    def metrics(self) -> dict:
+        snapshot = self._snapshot
+        metrics = dict(self._metrics)
+        metrics["tables_bytes"] = dict(self._metrics["tables_bytes"])
+        metrics["tables_total_bytes"] = sum(metrics["tables_bytes"].values())
+        metrics["version"] = snapshot.version if snapshot else None
+        metrics["loaded"] = snapshot is not None
+        metrics["indexed_diseases"] = len(snapshot.recommendations) if snapshot else 0
+        return metrics
+
+
+_registry = ModelRegistry()
+
+
+@traced("predict.knowledge_base")
+def get_knowledge_base() -> KnowledgeBase:
+    """Return the current warm model and tables, loading them on first use."""
+    return _registry.get()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def warm_up_registry():
+    """Load the model and tables eagerly so the first request does not pay for it."""
+    try:
+        _registry.get()
+    except Exception as e:
+        logger.error(f"Model registry warm-up failed: {str(e)}")
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List
+from pypdf import PdfReader
+from langchain_core.documents import Document
+from src.utils.logger import setup_logger
+from src.config import (
+    logger,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_PAYLOAD_SAMPLE_RATE,
+    PDF_WORKERS,
+    PDF_PAGES_PER_TASK,
+    PDF_MAX_IN_FLIGHT,
+    PDF_PARALLEL_MIN_PAGES,
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Pool worker setup: importing src.config attached the log file handlers again; keep only the console."""
+    setup_logger(LOG_LEVEL, LOG_LEVELS, False, LOG_PAYLOAD_SAMPLE_RATE, log_to_files=False)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                logger.info(f"Starting PDF extraction pool with {PDF_WORKERS} processes")
+                # spawn, not fork: the server process has Redis, FAISS and logging threads running
+                _pool = ProcessPoolExecutor(
+                    max_workers=PDF_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+    return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Forget a pool whose worker died so the next load starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            logger.error("PDF extraction pool is broken; it will be restarted")
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Per worker process only: the last file opened, so consecutive ranges of the
+# same file don't re-parse its xref table and page tree. Never set in the
+# server process, where it would keep the last file's buffers alive.
+_worker_reader = (None, None)
+
+
+def _open_reader(path: str) -> PdfReader:
+    global _worker_reader
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _worker_reader[0] != key:
+        _worker_reader = (key, PdfReader(path))
+    return _worker_reader[1]
+
+
+def _read_pages(reader: PdfReader, start: int, stop: int) -> List[tuple]:
+    """(page_number, text, page_label) for pages [start, stop) of one file."""
+    labels = reader.page_labels
+    return [(i, reader.pages[i].extract_text().strip(), labels[i]) for i in range(start, stop)]
+
+
+def _extract_pages(path: str, start: int, stop: int) -> List[tuple]:
+    """_read_pages() in a pool worker, reusing the worker's reader for the same file."""
+    return _read_pages(_open_reader(path), start, stop)
+
+
+def _page_document(path: str, total_pages: int, page: tuple) -> Document:
+    page_number, text, label = page
+    return Document(
+        page_content=text,
+        metadata={"source": path, "page": page_number, "page_label": label, "total_pages": total_pages},
+    )
+
+
+def iter_pdf_documents(
+    paths: List[str],
+    pages_per_task: int = PDF_PAGES_PER_TASK,
+    max_in_flight: int = PDF_MAX_IN_FLIGHT,
+) -> Iterator[Document]:
+    """Yield one Document per page, files and pages in order.
+
+    Page ranges are extracted in worker processes. At most max_in_flight
+    ranges are pending at once, so memory stays bounded however long the
+    files are.
+    """
+    counts = [(path, len(PdfReader(path).pages)) for path in paths]
+    tasks = [
+        (path, total, start, min(start + pages_per_task, total))
+        for path, total in counts
+        for start in range(0, total, pages_per_task)
+    ]
+    if sum(total for _, total in counts) < PDF_PARALLEL_MIN_PAGES:
+        # In process: a reader per file, local to this call so nothing outlives the load
+        for path, total in counts:
+            for page in _read_pages(PdfReader(path), 0, total):
+                yield _page_document(path, total, page)
+        return
+
+    pool = _get_pool()
+    pending = deque()
+    remaining = iter(tasks)
+    try:
+        for path, total, start, stop in remaining:
+            pending.append((path, total, pool.submit(_extract_pages, path, start, stop)))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            path, total, future = pending.popleft()
+            pages = future.result()
+            next_task = next(remaining, None)
+            if next_task:
+                next_path, next_total, start, stop = next_task
+                pending.append((next_path, next_total, pool.submit(_extract_pages, next_path, start, stop)))
+            for page in pages:
+                yield _page_document(path, total, page)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable
+from src.utils.symptom_vocabulary import symptom_vocabulary
+from src.config import PREDICTION_CACHE_MAX_ENTRIES
+
+
+def prediction_key(symptoms: Iterable[str], model_version: int, top_k: int = None) -> tuple:
+    """Canonical key: the bitset of symptom columns the model sees, the model version and top_k.
+
+    Aliases map to the same column and unknown symptoms are ignored by the
+    encoder, so neither changes the prediction or the key. Payloads with a
+    differential of a different length are kept apart.
+    """
+    return model_version, symptom_vocabulary.bitset(symptoms), top_k or 0
+
+
+class PredictionCache:
+    """Bounded LRU of prediction payloads (disease plus recommendations).
+
+    Payloads are shared between requests and must not be mutated; the
+    per-request ``detected_symptoms`` are never stored. max_entries=0
+    disables caching.
+    """
+
+    def __init__(self, max_entries: int = PREDICTION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, key: tuple, payload: dict):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+prediction_cache = PredictionCache()
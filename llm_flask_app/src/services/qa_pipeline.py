@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import List
+from langchain_core.messages import BaseMessage
+from src.services.llm_processor import (
+    PROMPT_VERSION, get_standalone_question_chain, get_question_answer_chain
+)
+from src.services.answer_cache import get_answer_cache, answer_cache_key
+from src.config import logger
+from src.utils.logger import PAYLOAD
+from src.utils.metrics import timed
+
+
+def get_standalone_question(question: str, chat_history: List[BaseMessage]) -> str:
+    """Rephrase the question using the chat history; without history it is used as is,
+    exactly as create_history_aware_retriever does."""
+    if not chat_history:
+        return question
+    with timed("qa.standalone_question"):
+        return get_standalone_question_chain().invoke({"input": question, "chat_history": chat_history})
+
+
+def prepare_answer(retriever, question: str, chat_history: List[BaseMessage]) -> dict:
+    """Standalone question -> retrieval -> answer cache lookup.
+
+    Returns {"context", "cache_key", "cached", "cache"}; "cached" holds the
+    cached entry or None on a miss (or when the cache is off).
+    """
+    standalone_question = get_standalone_question(question, chat_history)
+    with timed("qa.retrieve"):
+        context = retriever.invoke(standalone_question)
+    return _lookup_answer(standalone_question, context)
+
+
+def _lookup_answer(standalone_question: str, context) -> dict:
+    cache = get_answer_cache()
+    key = answer_cache_key(standalone_question, context, PROMPT_VERSION)
+    with timed("qa.cache_lookup"):
+        cached = cache.get(key) if cache else None
+    meta = {"hit": cached is not None, "backend": cache.backend if cache else "off", "key": key[:16]}
+    if cached:
+        meta["age_seconds"] = round(time.time() - cached["cached_at"], 3)
+        logger.info("Answer cache hit for standalone question: %s", standalone_question, extra=PAYLOAD)
+    return {"context": context, "cache_key": key, "cached": cached, "cache": meta}
+
+
+def store_answer(cache_key: str, answer: str):
+    cache = get_answer_cache()
+    if cache and answer:
+        cache.set(cache_key, answer)
+
+
+def answer_question(retriever, question: str, chat_history: List[BaseMessage]) -> dict:
+    """Answer from the cache when the same standalone question retrieves the same
+    chunks; otherwise run the QA chain and cache its answer.
+
+    Returns {"answer", "context", "cache"}.
+    """
+    prepared = prepare_answer(retriever, question, chat_history)
+    if prepared["cached"]:
+        answer = prepared["cached"]["answer"]
+    else:
+        with timed("qa.llm"):
+            answer = get_question_answer_chain().invoke(
+                {"input": question, "chat_history": chat_history, "context": prepared["context"]}
+            )
+        store_answer(prepared["cache_key"], answer)
+    return {"answer": answer, "context": prepared["context"], "cache": prepared["cache"]}
+
+
+async def _run_cache_call(func, *args):
+    """Run an answer cache call in a worker thread when the backend is Redis, so the
+    sync client doesn't block the event loop; the local cache is called directly."""
+    cache = get_answer_cache()
+    if cache is not None and cache.backend == "redis":
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+async def aget_standalone_question(question: str, chat_history: List[BaseMessage]) -> str:
+    if not chat_history:
+        return question
+    with timed("qa.standalone_question"):
+        return await get_standalone_question_chain().ainvoke({"input": question, "chat_history": chat_history})
+
+
+async def aanswer_question(retriever, question: str, chat_history: List[BaseMessage]) -> dict:
+    """answer_question() using ainvoke for the LLM calls and the async query embedding."""
+    standalone_question = await aget_standalone_question(question, chat_history)
+    with timed("qa.retrieve"):
+        context = await retriever.ainvoke(standalone_question)
+    prepared = await _run_cache_call(_lookup_answer, standalone_question, context)
+    if prepared["cached"]:
+        answer = prepared["cached"]["answer"]
+    else:
+        with timed("qa.llm"):
+            answer = await get_question_answer_chain().ainvoke(
+                {"input": question, "chat_history": chat_history, "context": context}
+            )
+        await _run_cache_call(store_answer, prepared["cache_key"], answer)
+    return {"answer": answer, "context": context, "cache": prepared["cache"]}
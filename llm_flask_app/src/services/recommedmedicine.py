@@ -1,16 +1,32 @@
+import copy
 import numpy as np
 import pandas as pd
 import pickle
-from src.utils.sym_disease import symptoms_dict, diseases_list, symptom_mapping
+from src.utils.sym_disease import diseases_list
+from src.utils.symptom_vocabulary import symptom_vocabulary
+from src.services.recommendation_index import lookup_recommendations
+from src.utils.symptom_matcher import symptom_matcher
 from src.config import logger
+from src.utils.logger import PAYLOAD
+from src.utils.metrics import traced
 import os
-import re
 
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
+TRAINING_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../trainingdata'))
+MODEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../picklemodel/svc.pkl'))
+DATA_FILES = (
+    "symtoms_df.csv",
+    "precautions_df.csv",
+    "workout_df.csv",
+    "description.csv",
+    "medications.csv",
+    "diets.csv",
+)
+
 def load_data():
-    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../trainingdata'))
+    base_path = TRAINING_DATA_DIR
     logger.info(f"Loading data from: {base_path}")
     
     def read_csv_safe(filename):
@@ -32,8 +48,7 @@ def load_data():
     return sym_des, precautions, workout, description, medications, diets
 
 def load_model():
-    current_dir = "llm_flask_app"
-    model_path = os.path.join(current_dir, 'picklemodel', 'svc.pkl')
+    model_path = MODEL_PATH
     if not os.path.exists(model_path):
         logger.error(f"Model file not found at {model_path}")
         raise FileNotFoundError(f"Model file not found at {model_path}")
@@ -45,71 +60,128 @@ def load_model():
     return model
 
 def identification_helper(dis, description, precautions, medications, diets, workout):
-    logger.info(f"Identifying information for disease: {dis}")
+    logger.info("Identifying information for disease: %s", dis, extra=PAYLOAD)
     
     desc = description[description['Disease'] == dis]['Description'].values
     desc = " ".join(desc) if len(desc) > 0 else "No description available."
-    logger.info(f"Description found: {desc}")
+    logger.info("Description found: %s", desc, extra=PAYLOAD)
 
     pre = precautions[precautions['Disease'] == dis][['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']]
     pre = pre.values.tolist()
     pre = pre[0] if pre else ["No precautions found."]
-    logger.info(f"Precautions found: {pre}")
+    logger.info("Precautions found: %s", pre, extra=PAYLOAD)
 
     med = medications[medications['Disease'] == dis]['Medication'].values.tolist()
     die = diets[diets['Disease'] == dis]['Diet'].values.tolist()
     wrkout = workout[workout['disease'] == dis]['workout'].values.tolist()
 
-    logger.info(f"Medications found: {med}")
-    logger.info(f"Diets found: {die}")
-    logger.info(f"Workouts found: {wrkout}")
+    logger.info("Medications found: %s", med, extra=PAYLOAD)
+    logger.info("Diets found: %s", die, extra=PAYLOAD)
+    logger.info("Workouts found: %s", wrkout, extra=PAYLOAD)
 
     return desc, pre, med, die, wrkout
 
 
 
 def get_predicted_value(patient_symptoms, svc):
-    logger.info(f"Getting predicted value for symptoms: {patient_symptoms}")
-    input_vector = np.zeros(len(symptoms_dict))
-    for item in patient_symptoms:
-        if item in symptoms_dict:
-            input_vector[symptoms_dict[item]] = 1
-    prediction = diseases_list[svc.predict([input_vector])[0]]
-    logger.info(f"Predicted disease: {prediction}")
+    logger.info("Getting predicted value for symptoms: %s", patient_symptoms, extra=PAYLOAD)
+    with symptom_vocabulary.encoded([patient_symptoms]) as input_matrix:
+        prediction = diseases_list[svc.predict(input_matrix)[0]]
+    logger.info("Predicted disease: %s", prediction, extra=PAYLOAD)
     return prediction
 
+@traced("predict.model")
+def get_predicted_values(patients_symptoms, svc):
+    """Predict a disease for every symptom list with one svc.predict call."""
+    if not patients_symptoms:
+        return []
+    logger.info("Getting predicted values for %d patients", len(patients_symptoms))
+    with symptom_vocabulary.encoded(patients_symptoms) as input_matrix:
+        predictions = svc.predict(input_matrix)
+    return [diseases_list[p] for p in predictions]
+
+class DiseaseRanker:
+    """Every disease the SVC knows, ranked for a symptom set, with its recommendations.
+
+    SVC.predict lets each of the n(n-1)/2 one-vs-one classifiers vote and
+    returns the class with most votes, the lowest class on a tie. Ranking all
+    classes by the same votes and tie rule keeps the first entry equal to the
+    prediction. libsvm returns the pairwise decision values for a whole batch
+    in one call ("ovo" shape, on a shallow copy of the model); the votes are
+    then one matrix product, where sklearn's "ovr" decision_function loops
+    over the pairs in Python (~20 ms per call for 41 classes).
+
+    ``score`` is the share of its pairwise contests a disease won. Models
+    fitted with probability=True also get the Platt-calibrated
+    ``probability``. Recommendation bundles are built once per class and are
+    shared between results; they must not be mutated.
+    """
+
+    def __init__(self, svc, recommendations):
+        self.svc = svc
+        self._ovo = copy.copy(svc)
+        self._ovo.decision_function_shape = "ovo"
+        n_classes = len(svc.classes_)
+        first, second = np.triu_indices(n_classes, 1)
+        pairs = np.arange(len(first))
+        as_first = np.zeros((len(pairs), n_classes))
+        as_first[pairs, first] = 1
+        as_second = np.zeros((len(pairs), n_classes))
+        as_second[pairs, second] = 1
+        # votes = wins @ vote_matrix + vote_offset, wins[k] = 1 when pair k votes for its first class;
+        # vote counts are small integers, exact in float32
+        self._vote_matrix = (as_first - as_second).astype(np.float32)
+        self._vote_offset = as_second.sum(axis=0).astype(np.float32)
+        self._contests = n_classes - 1
+        self.diseases = [diseases_list[label] for label in svc.classes_]
+        self.bundles = []
+        for disease in self.diseases:
+            dis_des, precautions_list, medications_list, rec_diet, workout_list = lookup_recommendations(
+                recommendations, disease
+            )
+            self.bundles.append({
+                "description": dis_des,
+                "precautions": precautions_list,
+                "medications": medications_list,
+                "diet": rec_diet,
+                "workout": workout_list
+            })
+
+    @traced("predict.rank")
+    def rank(self, patients_symptoms, top_k):
+        """Return the top_k diseases for every symptom list, best first, with one libsvm call."""
+        if not patients_symptoms:
+            return []
+        logger.info("Ranking top %d diseases for %d patients", top_k, len(patients_symptoms))
+        with symptom_vocabulary.encoded(patients_symptoms) as input_matrix:
+            decisions = self._ovo.decision_function(input_matrix)
+            probabilities = self.svc.predict_proba(input_matrix) if getattr(self.svc, "probability", False) else None
+        votes = (decisions > 0).astype(np.float32) @ self._vote_matrix + self._vote_offset
+        # Stable sort keeps ties in class order, like SVC.predict
+        order = np.argsort(-votes, axis=1, kind="stable")[:, :top_k]
+        # In float64, so the rounded scores serialize as 0.975 rather than 0.9750000238418579
+        top_votes = np.take_along_axis(votes, order, axis=1).astype(np.float64)
+        scores = np.round(top_votes / self._contests, 4).tolist()
+        if probabilities is not None:
+            probabilities = np.round(np.take_along_axis(probabilities, order, axis=1), 4).tolist()
+
+        results = []
+        for row, classes in enumerate(order.tolist()):
+            ranked = []
+            for position, label in enumerate(classes):
+                entry = {"disease": self.diseases[label], "score": scores[row][position]}
+                if probabilities is not None:
+                    entry["probability"] = probabilities[row][position]
+                entry.update(self.bundles[label])
+                ranked.append(entry)
+            results.append(ranked)
+        return results
+
+@traced("predict.extract")
 def extract_symptoms_from_text(text):
     """Extract symptoms from free text input using simple pattern matching"""
-    logger.info(f"Extracting symptoms from text: {text}")
-    text = text.lower()
-    extracted_symptoms = []
-    
-    # Check for multi-word symptoms first - create a pattern from the mapping keys
-    multi_word_symptoms = [k for k in symptom_mapping.keys() if ' ' in k]
-    for symptom in multi_word_symptoms:
-        if symptom in text:
-            mapped_symptom = symptom_mapping[symptom]
-            if mapped_symptom in symptoms_dict and mapped_symptom not in extracted_symptoms:
-                extracted_symptoms.append(mapped_symptom)
-                logger.info(f"Extracted multi-word symptom: {mapped_symptom}")
-    
-    # Check for single word symptoms and direct matches
-    words = re.findall(r'\b\w+\b', text)
-    
-    for word in words:
-        if word in symptom_mapping:
-            mapped_symptom = symptom_mapping[word]
-            if mapped_symptom in symptoms_dict and mapped_symptom not in extracted_symptoms:
-                extracted_symptoms.append(mapped_symptom)
-                logger.info(f"Extract ed single-word symptom: {mapped_symptom}")
-        elif word in symptoms_dict and word not in extracted_symptoms:
-            extracted_symptoms.append(word)
-            logger.info(f"Extracted symptom: {word}")
-    
-    for symptom in symptoms_dict:
-        if symptom in text and symptom not in extracted_symptoms:
-            extracted_symptoms.append(symptom)
-            logger.info(f"Directly matched symptom: {symptom}")
-    
-    logger.info(f"Final extracted symptoms: {extracted_symptoms}")
+    logger.info("Extracting symptoms from text: %s", text, extra=PAYLOAD)
+    # One linear pass of the precompiled automaton over the lowered text
+    extracted_symptoms = symptom_matcher.extract(text)
+    logger.info("Final extracted symptoms: %s", extracted_symptoms, extra=PAYLOAD)
     return extracted_symptoms
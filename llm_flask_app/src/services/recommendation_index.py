@@ -0,0 +1,111 @@
+import ast
+from collections import namedtuple
+from typing import Dict
+from src.config import logger
+
+
+Recommendation = namedtuple(
+    "Recommendation", ["description", "precautions", "medications", "diets", "workout"]
+)
+
+NO_RECOMMENDATION = Recommendation(
+    description="No description available.",
+    precautions=("No precautions found.",),
+    medications=(),
+    diets=(),
+    workout=(),
+)
+
+# Spellings used by the model labels that differ from the recommendation tables
+DISEASE_ALIASES = {
+    "peptic ulcer diseae": "peptic ulcer disease",
+}
+
+PRECAUTION_COLUMNS = ["Precaution_1", "Precaution_2", "Precaution_3", "Precaution_4"]
+
+
+def normalize_disease_name(name: str) -> str:
+    """Canonical lookup key: trimmed, single-spaced, case-folded, known typos fixed."""
+    key = " ".join(str(name).split()).casefold()
+    return DISEASE_ALIASES.get(key, key)
+
+
+def _parse_list(value) -> tuple:
+    """Parse a stringified Python list such as "['Garlic', 'Probiotics']"."""
+    if isinstance(value, (list, tuple)):
+        return tuple(str(v) for v in value)
+    if not isinstance(value, str):
+        return ()
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return (value,)
+    if isinstance(parsed, (list, tuple)):
+        return tuple(str(v) for v in parsed)
+    return (str(parsed),)
+
+
+def build_recommendation_index(description, precautions, medications, diets, workout) -> Dict[str, Recommendation]:
+    """Compile the recommendation tables into one disease-keyed dict of immutable records."""
+    logger.info("Building recommendation index.")
+    descriptions, precaution_map, medication_map, diet_map, workout_map = {}, {}, {}, {}, {}
+    names = {}
+
+    for disease, text in zip(description["Disease"], description["Description"]):
+        key = normalize_disease_name(disease)
+        names.setdefault(key, disease)
+        descriptions.setdefault(key, []).append(str(text))
+
+    for row in precautions[["Disease"] + PRECAUTION_COLUMNS].itertuples(index=False):
+        key = normalize_disease_name(row[0])
+        names.setdefault(key, row[0])
+        # Only the first row per disease is used, matching identification_helper
+        precaution_map.setdefault(
+            key, tuple(str(p).strip() for p in row[1:] if isinstance(p, str) and p.strip())
+        )
+
+    for disease, value in zip(medications["Disease"], medications["Medication"]):
+        key = normalize_disease_name(disease)
+        names.setdefault(key, disease)
+        medication_map.setdefault(key, []).extend(_parse_list(value))
+
+    for disease, value in zip(diets["Disease"], diets["Diet"]):
+        key = normalize_disease_name(disease)
+        names.setdefault(key, disease)
+        diet_map.setdefault(key, []).extend(_parse_list(value))
+
+    for disease, value in zip(workout["disease"], workout["workout"]):
+        key = normalize_disease_name(disease)
+        names.setdefault(key, disease)
+        workout_map.setdefault(key, []).append(str(value))
+
+    index = {}
+    for key in names:
+        index[key] = Recommendation(
+            description=" ".join(descriptions[key]) if key in descriptions else NO_RECOMMENDATION.description,
+            precautions=precaution_map.get(key) or NO_RECOMMENDATION.precautions,
+            medications=tuple(medication_map.get(key, ())),
+            diets=tuple(diet_map.get(key, ())),
+            workout=tuple(workout_map.get(key, ())),
+        )
+    logger.info(f"Recommendation index built for {len(index)} diseases.")
+    return index
+
+
+def lookup_recommendations(index: Dict[str, Recommendation], dis: str):
+    """O(1) replacement for identification_helper with parsed medication and diet lists.
+
+    Returns (description, precautions, medications, diets, workout) as lists so the
+    result can be passed straight to jsonify.
+    """
+    rec = index.get(normalize_disease_name(dis))
+    if rec is None:
+        logger.warning(f"No recommendations indexed for disease: {dis}")
+        rec = NO_RECOMMENDATION
+    return (
+        rec.description,
+        list(rec.precautions),
+        list(rec.medications),
+        list(rec.diets),
+        list(rec.workout),
+    )
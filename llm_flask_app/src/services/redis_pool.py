@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import weakref
+import redis
+import redis.asyncio
+from langchain_community.chat_message_histories import RedisChatMessageHistory
+from src.config import (
+    logger,
+    REDIS_HISTORY_URL,
+    REDIS_POOL_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_HEALTH_CHECK_INTERVAL,
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis_client() -> redis.Redis:
+    """Process-wide Redis client backed by one bounded, health-checked pool."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                logger.info(
+                    f"Creating Redis connection pool (max {REDIS_POOL_MAX_CONNECTIONS} connections)"
+                )
+                pool = redis.BlockingConnectionPool.from_url(
+                    REDIS_HISTORY_URL,
+                    max_connections=REDIS_POOL_MAX_CONNECTIONS,
+                    timeout=REDIS_POOL_TIMEOUT,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+                    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                )
+                _client = redis.Redis(connection_pool=pool)
+    return _client
+
+
+def set_redis_client(client: redis.Redis):
+    """Use a different client for all history access, e.g. fakeredis.FakeRedis()."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+# redis.asyncio connections belong to the event loop that opened them, so the
+# async client is kept per loop (one long-lived loop under the ASGI server)
+_async_clients = weakref.WeakKeyDictionary()
+_async_client_factory = None
+
+
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """Async client for the running event loop, with its own bounded pool."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        if _async_client_factory is not None:
+            client = _async_client_factory()
+        else:
+            logger.info(f"Creating async Redis client (max {REDIS_POOL_MAX_CONNECTIONS} connections)")
+            client = redis.asyncio.Redis(connection_pool=redis.asyncio.BlockingConnectionPool.from_url(
+                REDIS_HISTORY_URL,
+                max_connections=REDIS_POOL_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+            ))
+        _async_clients[loop] = client
+    return client
+
+
+def set_async_redis_client_factory(factory):
+    """Build async clients with factory(), e.g. lambda: fakeredis.aioredis.FakeRedis(server=server)."""
+    global _async_client_factory
+    _async_client_factory = factory
+    _async_clients.clear()
+
+
+async def close_async_redis_client():
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class PooledRedisChatMessageHistory(RedisChatMessageHistory):
+    """RedisChatMessageHistory that borrows connections from the shared pool.
+
+    The parent constructor builds a new client from a URL on every call, so it
+    is bypassed; storage layout and all read/write methods are inherited.
+    """
+
+    def __init__(self, session_id: str, key_prefix: str = "message_store:", ttl: int | None = None):
+        self.redis_client = get_redis_client()
+        self.session_id = session_id
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+
+
+def get_redis_history(session_id: str) -> PooledRedisChatMessageHistory:
+    return PooledRedisChatMessageHistory(session_id=session_id)
+
+
+def get_pool_stats() -> dict:
+    """Connection pool utilization: created, idle and in-use connections."""
+    client = get_redis_client()
+    pool = client.connection_pool
+    if isinstance(pool, redis.BlockingConnectionPool):
+        created = len(pool._connections)
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    else:
+        created = getattr(pool, "_created_connections", 0)
+        idle = len(getattr(pool, "_available_connections", []))
+    in_use = created - idle
+    try:
+        healthy = bool(client.ping())
+    except redis.RedisError as e:
+        logger.error(f"Redis health check failed: {str(e)}")
+        healthy = False
+    return {
+        "max_connections": pool.max_connections,
+        "created_connections": created,
+        "idle_connections": idle,
+        "in_use_connections": in_use,
+        "utilization": round(in_use / pool.max_connections, 4) if pool.max_connections else 0.0,
+        "healthy": healthy,
+    }
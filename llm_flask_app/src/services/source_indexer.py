@@ -0,0 +1,181 @@
+import hashlib
+import os
+import time
+from itertools import chain, count, groupby
+from typing import Callable, Iterable, Iterator, List, Union
+from langchain_core.documents import Document
+from src.services.content_loader import lazy_load_content, iter_text_chunks, iter_chunk_batches, file_hash
+from src.services.vector_store import vector_store_manager, chunk_id
+from src.utils.metrics import timed_iter
+from src.config import logger, CHUNK_SETTINGS, DEFAULT_CHUNK_SETTINGS
+
+
+def source_fingerprint(src: str, source_type: str) -> tuple:
+    """(manifest key, content hash) for one source; web pages have no hash before they are fetched."""
+    if source_type == "raw":
+        digest = hashlib.sha256(src.encode("utf-8")).hexdigest()
+        return f"raw:{digest}", digest
+    if source_type in ("pdf", "text"):
+        return str(src), file_hash(src)
+    return str(src), None
+
+
+def _source_of(source_type: str):
+    """Key function telling which source a loaded document came from.
+
+    PDF pages, text blocks and web pages carry their path or URL as "source";
+    raw strings are all "raw_input" but arrive one document per source.
+    """
+    if source_type == "raw":
+        position = count()
+        return lambda document: next(position)
+    return lambda document: document.metadata["source"]
+
+
+def _track_read(documents: Iterable[Document], src: str, source_type: str, state: dict) -> Iterator[Document]:
+    """Pass documents through, keeping state["fraction"] at the share of the source read so far.
+
+    PDFs are measured in pages and text files in bytes; raw text and a web
+    page arrive as one document.
+    """
+    size = os.path.getsize(src) if source_type == "text" else 0
+    read = 0
+    for document in documents:
+        if source_type == "pdf":
+            state["fraction"] = (document.metadata["page"] + 1) / document.metadata["total_pages"]
+        elif size:
+            read += len(document.page_content.encode("utf-8"))
+            state["fraction"] = min(read / size, 1.0)
+        yield document
+    state["fraction"] = 1.0
+
+
+def _empty_report() -> dict:
+    return {
+        "sources_unchanged": 0,
+        "chunks_total": 0,
+        "chunks_reused": 0,
+        "chunks_embedded": 0,
+        "chunks_removed": 0,
+    }
+
+
+def _index_documents(
+    user_name: str,
+    key: str,
+    content_hash: str | None,
+    documents: Iterable[Document],
+    source_type: str,
+    checkpoint_seconds: float | None = None,
+    on_batch: Callable[[int], None] | None = None,
+) -> dict:
+    """Chunk and embed one source's documents, then record its manifest entry; returns its report."""
+    chunk_settings = list(CHUNK_SETTINGS.get(source_type, DEFAULT_CHUNK_SETTINGS))
+    report = _empty_report()
+    chunk_ids = {}
+    last_save = time.monotonic()
+    chunks = iter_text_chunks(documents, source_type)
+    # Loading and chunking happen lazily inside next(), so they are timed there. They
+    # also run before add_texts() takes the per-user lock, so a slow fetch never holds it
+    for batch in timed_iter("index.load_chunk", iter_chunk_batches(chunks)):
+        texts = [chunk.page_content for chunk in batch]
+        # Each save rewrites the whole index, so saving every batch would make I/O quadratic
+        checkpoint = checkpoint_seconds is not None and time.monotonic() - last_save >= checkpoint_seconds
+        embedded = vector_store_manager.add_texts(
+            user_name, texts, [chunk.metadata for chunk in batch], save=checkpoint
+        )
+        if checkpoint and embedded:
+            last_save = time.monotonic()
+        chunk_ids.update(dict.fromkeys(chunk_id(text) for text in texts))
+        report["chunks_total"] += len(batch)
+        report["chunks_embedded"] += embedded
+        if on_batch:
+            on_batch(report["chunks_total"])
+
+    if not chunk_ids:
+        return report
+    report["chunks_reused"] = report["chunks_total"] - report["chunks_embedded"]
+    report["chunks_removed"] = vector_store_manager.record_source(
+        user_name,
+        key,
+        {"content_hash": content_hash, "chunk_settings": chunk_settings, "chunk_ids": list(chunk_ids)},
+    )
+    logger.info(f"Indexed {key} for user {user_name}: {report}")
+    return report
+
+
+def index_sources(
+    user_name: str,
+    source: Union[str, List[str]],
+    source_type: str,
+    source_key: str | None = None,
+    checkpoint_seconds: float | None = None,
+    on_batch: Callable[[int, float], None] | None = None,
+):
+    """Index sources incrementally; returns (vector_store, report) summed over them.
+
+    A file whose hash and chunk settings match the user's manifest is not
+    loaded at all. The rest are loaded in one loader call, so web pages are
+    fetched concurrently and PDFs share the extraction pipeline; the
+    documents are then split back by source. Only chunks missing from the
+    index are embedded, and chunks a source no longer produces are deleted.
+    source_key only applies to a single source.
+
+    Batches are added to the in-memory index as they are embedded; the index
+    is written once per source at the end, plus every checkpoint_seconds if
+    given. on_batch(chunks_done, fraction) is called after each batch, where
+    fraction is the share of the sources read so far.
+    """
+    sources = [source] if isinstance(source, str) else source
+    if not isinstance(sources, list):
+        raise ValueError("Source must be a string or list of strings")
+    user_folder = user_name if user_name else "anonymous"
+    chunk_settings = list(CHUNK_SETTINGS.get(source_type, DEFAULT_CHUNK_SETTINGS))
+    try:
+        total = _empty_report()
+        changed = {}
+        for src in sources:
+            key, content_hash = source_fingerprint(src, source_type)
+            key = (source_key if len(sources) == 1 else None) or key
+            if key in changed:
+                continue
+            entry = vector_store_manager.manifest_entry(user_folder, key)
+            if entry and content_hash and entry["content_hash"] == content_hash and entry["chunk_settings"] == chunk_settings:
+                logger.info(f"Source {key} unchanged for user: {user_folder}; reusing {len(entry['chunk_ids'])} chunks")
+                total["sources_unchanged"] += 1
+                total["chunks_total"] += len(entry["chunk_ids"])
+                total["chunks_reused"] += len(entry["chunk_ids"])
+            else:
+                changed[key] = (src, content_hash)
+        done_sources = len(sources) - len(changed)
+        if on_batch and done_sources:
+            on_batch(total["chunks_total"], done_sources / len(sources))
+
+        if changed:
+            pending = list(changed.items())
+            documents = lazy_load_content([src for src, _ in changed.values()], source_type)
+            for _, group in groupby(documents, key=_source_of(source_type)):
+                # Sources come back in order; web pages that failed to load are missing
+                first = next(group)
+                while source_type != "raw" and str(pending[0][1][0]) != first.metadata["source"]:
+                    pending.pop(0)
+                key, (src, content_hash) = pending.pop(0)
+                read, done = {"fraction": 0.0}, total["chunks_total"]
+                report = _index_documents(
+                    user_folder,
+                    key,
+                    content_hash,
+                    _track_read(chain([first], group), src, source_type, read),
+                    source_type,
+                    checkpoint_seconds=checkpoint_seconds,
+                    on_batch=(lambda n: on_batch(done + n, (done_sources + read["fraction"]) / len(sources)))
+                    if on_batch
+                    else None,
+                )
+                done_sources += 1
+                for field, value in report.items():
+                    total[field] += value
+        return vector_store_manager.get(user_folder), total
+    except Exception as e:
+        logger.error(f"Error indexing sources for {user_folder}: {str(e)}")
+        raise Exception(f"Error indexing sources: {e}")
@@ -1,24 +1,345 @@
+import copy
+import fcntl
 import os
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import List
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
-from src.services.llm_processor import get_embeddings
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from src.services.embedding_cache import get_cached_embeddings
+from src.utils.metrics import timed
 import shutil
-from src.config import logger
+from src.config import logger, FAISS_DB_DIR, VECTOR_STORE_CACHE_MAX_BYTES
+
+# Saved next to index.faiss/index.pkl; records which chunks each source contributed
+MANIFEST_FILE = "manifest.json"
+
+
+def chunk_id(text: str) -> str:
+    """Stable docstore id for a chunk so re-sent chunks are recognised and skipped."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _estimate_bytes(vector_store: FAISS) -> int:
+    index = vector_store.index
+    texts = sum(len(doc.page_content) for doc in vector_store.docstore._dict.values())
+    return index.ntotal * index.d * 4 + texts
+
+
+class VectorStoreManager:
+    """Per-user FAISS indexes: loaded from disk once, appended to, saved atomically.
+
+    Hot indexes stay in an LRU cache bounded by their estimated size in bytes;
+    an index with unsaved batches is not evicted until it has been saved.
+    Each user has a lock so concurrent requests for the same user serialise
+    their load/append/save while different users proceed in parallel.
+
+    An index returned by get() may be searched by retrievers without the
+    lock, so the next write copies it instead of mutating it in place.
+    On disk, <user> is a symlink to a versioned directory, so a save swaps in
+    the new version with one rename. Other worker processes save too: every
+    load checks the symlink target and rereads a version it has not seen, and
+    writes also hold an flock on <user>.lock so they apply to the latest one.
+    """
+
+    def __init__(self, base_dir: str = FAISS_DB_DIR, max_cache_bytes: int = VECTOR_STORE_CACHE_MAX_BYTES):
+        self.base_dir = base_dir
+        self.max_cache_bytes = max_cache_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self._user_locks = {}
+        self._manifests = {}
+        # Users whose cached index has been handed to readers since its last write
+        self._published = set()
+        # On-disk version the user's in-memory index and manifest were read from or saved as
+        self._versions = {}
+        # Batches added since the last save, replayed if another worker saves first
+        self._pending = {}
+
+    def user_path(self, user_name: str) -> str:
+        return os.path.join(self.base_dir, user_name)
+
+    def _user_lock(self, user_name: str) -> threading.Lock:
+        with self._cache_lock:
+            return self._user_locks.setdefault(user_name, threading.Lock())
+
+    @contextmanager
+    def _write_lock(self, user_name: str):
+        """The per-user lock, plus an flock so writes from other worker processes wait too."""
+        with self._user_lock(user_name):
+            os.makedirs(self.base_dir, exist_ok=True)
+            with open(os.path.join(self.base_dir, f"{user_name}.lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                yield
+
+    def _disk_version(self, user_name: str):
+        """The symlink target of the user's current index, or None if there is none."""
+        path = self.user_path(user_name)
+        if os.path.islink(path):
+            return os.readlink(path)
+        if os.path.exists(os.path.join(path, "index.faiss")):
+            # Saved before indexes were versioned; it changes with the next save
+            return "legacy"
+        return None
+
+    def _cache_get(self, user_name: str):
+        with self._cache_lock:
+            entry = self._cache.get(user_name)
+            if entry is None:
+                return None
+            self._cache.move_to_end(user_name)
+            return entry[0]
+
+    def _cache_put(self, user_name: str, vector_store: FAISS):
+        size = _estimate_bytes(vector_store)
+        with self._cache_lock:
+            old = self._cache.pop(user_name, None)
+            if old is not None:
+                self._cache_bytes -= old[1]
+            self._cache[user_name] = (vector_store, size)
+            self._cache_bytes += size
+            # Always keep the entry just used, even if it alone exceeds the budget, and
+            # indexes with batches not yet saved: they exist nowhere else
+            while self._cache_bytes > self.max_cache_bytes:
+                evicted = next((u for u in self._cache if u != user_name and u not in self._pending), None)
+                if evicted is None:
+                    break
+                _, evicted_size = self._cache.pop(evicted)
+                self._cache_bytes -= evicted_size
+                logger.info(f"Evicted vector store for {evicted} from memory ({evicted_size} bytes)")
+
+    def _cache_drop(self, user_name: str):
+        with self._cache_lock:
+            entry = self._cache.pop(user_name, None)
+            if entry is not None:
+                self._cache_bytes -= entry[1]
+
+    def _load(self, user_name: str):
+        version = self._disk_version(user_name)
+        vector_store = self._cache_get(user_name)
+        if vector_store is not None and self._versions.get(user_name) == version:
+            return vector_store
+        if version is None:
+            if vector_store is not None:
+                # Another worker cleared the index; unsaved batches went with it
+                logger.info(f"Vector store for {user_name} was removed on disk")
+                self._cache_drop(user_name)
+                self._pending.pop(user_name, None)
+            self._versions[user_name] = None
+            return None
+        path = self.user_path(user_name)
+        if version != "legacy":
+            # Read the version itself, so a concurrent save cannot mix files from two
+            path = os.path.join(self.base_dir, version)
+        logger.info(f"Loading vector store for {user_name} from {path}")
+        # The index was pickled by this service, never by a client
+        with timed("index.faiss_load"):
+            vector_store = FAISS.load_local(path, get_cached_embeddings(), allow_dangerous_deserialization=True)
+        for texts, vectors, metadatas, ids in self._pending.get(user_name, []):
+            new = [i for i, text_id in enumerate(ids) if text_id not in vector_store.docstore._dict]
+            if new:
+                vector_store.add_embeddings(
+                    [(texts[i], vectors[i]) for i in new],
+                    metadatas=[metadatas[i] for i in new],
+                    ids=[ids[i] for i in new],
+                )
+        self._versions[user_name] = version
+        self._published.discard(user_name)
+        self._cache_put(user_name, vector_store)
+        return vector_store
+
+    def _writable(self, user_name: str, vector_store: FAISS) -> FAISS:
+        """vector_store itself, or a copy if readers may be searching it."""
+        if user_name not in self._published:
+            return vector_store
+        self._published.discard(user_name)
+        with timed("index.copy"):
+            writable = copy.copy(vector_store)
+            writable.index = dependable_faiss_import().clone_index(vector_store.index)
+            writable.docstore = InMemoryDocstore(dict(vector_store.docstore._dict))
+            writable.index_to_docstore_id = dict(vector_store.index_to_docstore_id)
+        return writable
+
+    def _manifest(self, user_name: str) -> dict:
+        """Source key -> {content_hash, chunk_settings, chunk_ids} for the user's index."""
+        version = self._disk_version(user_name)
+        cached = self._manifests.get(user_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        manifest = {}
+        if version is not None:
+            directory = self.user_path(user_name) if version == "legacy" else os.path.join(self.base_dir, version)
+            manifest_path = os.path.join(directory, MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                with open(manifest_path, encoding="utf-8") as f:
+                    manifest = json.load(f)
+        self._manifests[user_name] = (version, manifest)
+        return manifest
+
+    def _save(self, user_name: str, vector_store: FAISS):
+        path = self.user_path(user_name)
+        os.makedirs(self.base_dir, exist_ok=True)
+        version_path = f"{path}.v-{uuid.uuid4().hex}"
+        link_path = f"{path}.link-{uuid.uuid4().hex}"
+        manifest = self._manifest(user_name)
+        with timed("index.save"):
+            vector_store.save_local(version_path)
+            with open(os.path.join(version_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            # Point a new symlink at the fully written version and rename it over
+            # the old one: readers see either version, never a missing index
+            os.symlink(os.path.basename(version_path), link_path)
+            previous = os.path.realpath(path) if os.path.islink(path) else None
+            if os.path.isdir(path) and previous is None:
+                # Saved before indexes were versioned; the directory is moved aside once
+                previous = f"{path}.old-{uuid.uuid4().hex}"
+                os.rename(path, previous)
+            os.replace(link_path, path)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+        version = os.path.basename(version_path)
+        self._versions[user_name] = version
+        self._manifests[user_name] = (version, manifest)
+        self._pending.pop(user_name, None)
+        logger.info(f"Vector store saved to {path}")
+
+    def get(self, user_name: str):
+        """Return the user's index from memory or disk, or None if there is none.
+
+        Later writes leave the returned index unchanged, so it can be searched
+        without holding any lock.
+        """
+        with self._user_lock(user_name):
+            vector_store = self._load(user_name)
+            if vector_store is not None:
+                self._published.add(user_name)
+            return vector_store
+
+    def _append(self, user_name: str, vector_store, texts: List[str], metadatas: List[dict] | None):
+        """Embed texts not already in vector_store (created if None); returns (store, embedded)."""
+        metadatas = metadatas or [{} for _ in texts]
+        known = vector_store.docstore._dict if vector_store is not None else {}
+        new_texts, new_metadatas, new_ids, seen = [], [], [], set()
+        for text, metadata in zip(texts, metadatas):
+            text_id = chunk_id(text)
+            if text_id not in known and text_id not in seen:
+                seen.add(text_id)
+                new_texts.append(text)
+                new_metadatas.append(metadata)
+                new_ids.append(text_id)
+        if not new_texts:
+            return vector_store, 0
+        # Embedding and the FAISS insert are done separately so each is timed on its own
+        embeddings = get_cached_embeddings()
+        with timed("index.embed"):
+            vectors = embeddings.embed_documents(new_texts)
+        self._pending.setdefault(user_name, []).append((new_texts, vectors, new_metadatas, new_ids))
+        with timed("index.faiss_add"):
+            if vector_store is None:
+                vector_store = FAISS.from_embeddings(
+                    list(zip(new_texts, vectors)), embeddings, metadatas=new_metadatas, ids=new_ids
+                )
+            else:
+                vector_store = self._writable(user_name, vector_store)
+                vector_store.add_embeddings(list(zip(new_texts, vectors)), metadatas=new_metadatas, ids=new_ids)
+        return vector_store, len(new_texts)
+
+    def add_texts(self, user_name: str, text_chunks: List[str], metadatas: List[dict] | None = None, save: bool = True) -> int:
+        """Embed and append only chunks the user's index does not already contain.
+
+        Returns the number of chunks embedded. With save=False the index is
+        only updated in memory; a later record_source() or add_texts() writes it.
+        """
+        with self._write_lock(user_name):
+            vector_store = self._load(user_name)
+            vector_store, embedded = self._append(user_name, vector_store, text_chunks, metadatas)
+            logger.info(f"{embedded} new of {len(text_chunks)} chunks to index for user: {user_name}")
+            if embedded:
+                if save:
+                    self._save(user_name, vector_store)
+                self._cache_put(user_name, vector_store)
+            return embedded
+
+    def manifest_entry(self, user_name: str, source_key: str) -> dict | None:
+        with self._user_lock(user_name):
+            entry = self._manifest(user_name).get(source_key)
+            return dict(entry) if entry else None
+
+    def record_source(self, user_name: str, source_key: str, entry: dict) -> int:
+        """Store a source's manifest entry and delete the chunks it no longer has.
+
+        Chunks still listed by another source are kept. Saves the index and
+        returns the number of chunks removed.
+        """
+        with self._write_lock(user_name):
+            manifest = self._manifest(user_name)
+            vector_store = self._load(user_name)
+            old = manifest.get(source_key)
+            # With no index on disk there is nothing left to delete
+            stale = set(old["chunk_ids"]) - set(entry["chunk_ids"]) if old and vector_store is not None else set()
+            if stale:
+                for key, other in manifest.items():
+                    if key != source_key:
+                        stale.difference_update(other["chunk_ids"])
+                stale = [text_id for text_id in stale if text_id in vector_store.docstore._dict]
+            if stale:
+                vector_store = self._writable(user_name, vector_store)
+                vector_store.delete(stale)
+                logger.info(f"Removed {len(stale)} stale chunks of {source_key} for user: {user_name}")
+            manifest[source_key] = entry
+            if vector_store is not None:
+                self._save(user_name, vector_store)
+                self._cache_put(user_name, vector_store)
+            return len(stale)
+
+    def clear(self, user_name: str) -> bool:
+        """Remove the user's index from memory and disk; True if one existed on disk."""
+        with self._write_lock(user_name):
+            self._cache_drop(user_name)
+            self._manifests.pop(user_name, None)
+            self._published.discard(user_name)
+            self._versions.pop(user_name, None)
+            self._pending.pop(user_name, None)
+            path = self.user_path(user_name)
+            if os.path.islink(path):
+                version_path = os.path.realpath(path)
+                os.unlink(path)
+                shutil.rmtree(version_path, ignore_errors=True)
+                return True
+            if os.path.exists(path):
+                shutil.rmtree(path)
+                return True
+            return False
+
+    def stats(self) -> dict:
+        with self._cache_lock:
+            return {
+                "cached_users": len(self._cache),
+                "cached_bytes": self._cache_bytes,
+                "max_cache_bytes": self.max_cache_bytes,
+            }
+
+
+vector_store_manager = VectorStoreManager()
 
 
 def get_vector_store(text_chunks: List[str], user_name: str | None = None):
-    embeddings = get_embeddings()
+    user_folder = user_name if user_name else "anonymous"
     try:
         logger.info(
-            f"Creating vector store with {len(text_chunks)} chunks for user: {user_name or 'anonymous'}"
+            f"Updating vector store with {len(text_chunks)} chunks for user: {user_folder}"
         )
-        vector_store = FAISS.from_texts(texts=text_chunks, embedding=embeddings)
-        user_folder = user_name if user_name else "anonymous"
-        save_path = os.path.join("llm_flask_app/faissdb", user_folder)
-
-        os.makedirs(save_path, exist_ok=True)
-        vector_store.save_local(save_path)
-        logger.info(f"Vector store saved to {save_path}")
+        if text_chunks:
+            vector_store_manager.add_texts(user_folder, text_chunks)
+        vector_store = vector_store_manager.get(user_folder)
+        if vector_store is None:
+            logger.warning(f"No existing vector store for user: {user_folder}")
         return vector_store
     except Exception as e:
         logger.error(f"Error creating vector store: {str(e)}")
@@ -27,10 +348,8 @@ def get_vector_store(text_chunks: List[str], user_name: str | None = None):
 
 def clear_user_vector_store(user_name: str):
     try:
-        user_folder = os.path.join("llm_flask_app/faissdb", user_name)
-        if os.path.exists(user_folder):
-            logger.info(f"Clearing vector store for user: {user_name}")
-            shutil.rmtree(user_folder)
+        logger.info(f"Clearing vector store for user: {user_name}")
+        if vector_store_manager.clear(user_name):
             logger.info(f"Vector store cleared for {user_name}")
             return f"Vector store for {user_name} cleared."
         logger.info(f"No vector store found for user: {user_name}")
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+from urllib.parse import urlsplit
+import requests
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
+from src.config import (
+    logger,
+    USER_AGENT,
+    WEB_FETCH_WORKERS,
+    WEB_FETCH_PER_HOST,
+    WEB_FETCH_TIMEOUT,
+    WEB_FETCH_RETRIES,
+    WEB_FETCH_BACKOFF,
+    WEB_CACHE_DIR,
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ResponseCache:
+    """On-disk page cache: <sha256(url)>.body plus a .json file with validators."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def get(self, url: str):
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, url: str, body: bytes, etag: str | None, last_modified: str | None):
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+        # Write the body before its validators so a crash never pairs new headers with an old body
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode("utf-8"))):
+            tmp = path.with_suffix(path.suffix + f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+
+class ConcurrentWebLoader:
+    """Fetch many URLs at once with per-host limits, retries and conditional GETs.
+
+    Returns one Document per page in input order, with the same text and
+    metadata (source, title, description, language) as WebBaseLoader.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = WEB_FETCH_WORKERS,
+        per_host: int = WEB_FETCH_PER_HOST,
+        timeout=WEB_FETCH_TIMEOUT,
+        retries: int = WEB_FETCH_RETRIES,
+        backoff: float = WEB_FETCH_BACKOFF,
+        cache_dir: str | None = WEB_CACHE_DIR,
+    ):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        # Long-lived so each thread's keep-alive session is reused across loads
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web")
+        self._local = threading.local()
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        # requests.Session is not thread-safe; each fetch thread keeps its own keep-alive pool
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def fetch(self, url: str) -> bytes:
+        """Page body for url, revalidating a cached copy when one exists."""
+        meta, cached_body = self.cache.get(url) if self.cache else (None, None)
+        headers = {}
+        if meta and cached_body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        for attempt in range(self.retries + 1):
+            try:
+                with self._host_slot(url):
+                    response = self._session().get(url, headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and cached_body is not None:
+                    logger.debug(f"Not modified, using cached copy: {url}")
+                    return cached_body
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+                body = response.content
+                if self.cache:
+                    self.cache.put(url, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return body
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                status = e.response.status_code if e.response is not None else None
+                if attempt >= self.retries or (status is not None and status not in RETRY_STATUSES):
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                logger.warning(f"Fetch of {url} failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _load_one(self, url: str) -> Document:
+        soup = BeautifulSoup(self.fetch(url), "html.parser")
+        metadata = {"source": url}
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text()
+        if description := soup.find("meta", attrs={"name": "description"}):
+            metadata["description"] = description.get("content", "No description found.")
+        if html := soup.find("html"):
+            metadata["language"] = html.get("lang", "No language found.")
+        return Document(page_content=soup.get_text(), metadata=metadata)
+
+    def load(self, urls: List[str]) -> List[Document]:
+        """Load every URL; pages that still fail after retries are logged and skipped."""
+        if not urls:
+            return []
+        documents = []
+        futures = [(url, self._executor.submit(self._load_one, url)) for url in urls]
+        for url, future in futures:
+            try:
+                documents.append(future.result())
+            except Exception as e:
+                logger.error(f"Failed to load {url}: {str(e)}")
+        if not documents:
+            raise ValueError(f"None of the {len(urls)} URL(s) could be loaded")
+        logger.info(f"Loaded {len(documents)} of {len(urls)} web pages")
+        return documents
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_web_loader() -> ConcurrentWebLoader:
+    global _loader
+    if _loader is None:
+        with _loader_lock:
+            if _loader is None:
+                _loader = ConcurrentWebLoader()
+    return _loader
+
+
+def load_web_documents(urls: List[str]) -> List[Document]:
+    return get_web_loader().load(urls)
@@ -1,44 +1,203 @@
 import os
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import time
 
-def setup_logger():
-    """Configure the application's logging system with file rotation"""
-    
+# Pass as extra= on records that carry request payloads (questions, answers,
+# symptoms, recommendation lists); only LOG_PAYLOAD_SAMPLE_RATE of them are kept
+PAYLOAD = {"payload": True}
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_listener = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread.
+
+    The stock prepare() renders the message and any traceback on the calling
+    thread; here the record is queued as is, so %-style arguments are only
+    formatted by the background writer. Arguments must not be mutated after
+    the call that logs them.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class ModuleLevelFilter(logging.Filter):
+    """Per-module levels, applied where records reach the handlers.
+
+    App modules log with ``from src.config import logger`` (the root logger),
+    so their module is taken from the record's file path; records from named
+    (e.g. third-party) loggers are matched by logger name. The longest
+    matching dotted prefix in ``levels`` wins and everything else gets
+    ``default``. It must be attached to handlers: a filter on the root logger
+    never sees records propagated from named loggers.
+    """
+
+    def __init__(self, levels: dict, default: int):
+        super().__init__()
+        self.levels = levels
+        self.default = default
+        self._by_source = {}
+
+    def _match(self, module: str) -> int:
+        matches = [p for p in self.levels if module == p or module.startswith(p + ".")]
+        return self.levels[max(matches, key=len)] if matches else self.default
+
+    def _level_for(self, name: str, pathname: str) -> int:
+        key = (name, pathname)
+        level = self._by_source.get(key)
+        if level is None:
+            if name == "root":
+                module = os.path.splitext(os.path.relpath(pathname, APP_DIR))[0].replace(os.sep, ".")
+            else:
+                module = name
+            level = self._by_source[key] = self._match(module)
+        return level
+
+    def filter(self, record):
+        return record.levelno >= self._level_for(record.name, record.pathname)
+
+
+class PayloadSampler(logging.Filter):
+    """Keep a random share of records logged with extra=PAYLOAD; others always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, "payload", False):
+            return True
+        return random.random() < self.rate
+
+
+def parse_levels(spec: str) -> dict:
+    """Parse "werkzeug=WARNING,src.routes.medical_routes=ERROR" into {name: level}."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level_name = item.partition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not name.strip() or not isinstance(level, int):
+            raise ValueError(f"Invalid log level setting: {item!r}")
+        levels[name.strip()] = level
+    return levels
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_listener_after_fork():
+    """Give a forked child (e.g. a gunicorn worker) its own queue and writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    records = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DeferredQueueHandler):
+            handler.queue = records
+    _listener = QueueListener(records, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def setup_logger(
+    level: str = "INFO",
+    module_levels: str = "",
+    use_queue: bool = True,
+    payload_sample_rate: float = 1.0,
+    log_dir: str = None,
+    log_to_files: bool = True,
+):
+    """Configure the application's logging system with file rotation
+
+    With use_queue the request thread only enqueues records; a background
+    QueueListener formats them and writes the console and file handlers.
+    With log_to_files=False only the console handler is kept, for helper
+    processes that must not rotate the server's log files.
+    """
+    global _listener
+
     # Create logs directory if it doesn't exist
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
-    os.makedirs(log_dir, exist_ok=True)
-    
-    # Configure the root logger
+    log_dir = log_dir or os.path.join(APP_DIR, 'logs')
+    if log_to_files:
+        os.makedirs(log_dir, exist_ok=True)
+
+    default_level = logging.getLevelName(level.upper())
+    if not isinstance(default_level, int):
+        raise ValueError(f"Invalid log level: {level!r}")
+    levels = parse_levels(module_levels)
+
+    # Configure the root logger; it must let through the lowest level any module asks for.
+    # Loggers without a level of their own inherit it, so ModuleLevelFilter on the
+    # handlers holds every other module back to the default level.
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    
-    # Clear any existing handlers to avoid duplicate logs
-    if logger.handlers:
-        logger.handlers.clear()
-    
+    logger.setLevel(min([default_level, *levels.values()]))
+    for name, name_level in levels.items():
+        # Named (e.g. third-party) loggers also filter themselves
+        logging.getLogger(name).setLevel(name_level)
+
+    # Clear any existing handlers and filters to avoid duplicate logs
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+    logger.filters.clear()
+    if payload_sample_rate < 1:
+        logger.addFilter(PayloadSampler(payload_sample_rate))
+
     # Create formatters
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
-    
+
     # Create console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+
+    if not log_to_files:
+        handlers = (console_handler,)
+    else:
+        handlers = (console_handler, *_file_handlers(log_dir, formatter))
+    level_filter = ModuleLevelFilter(levels, default_level) if levels else None
+    if use_queue:
+        records = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(records)
+        if level_filter:
+            # Drop records before they are queued
+            queue_handler.addFilter(level_filter)
+        logger.addHandler(queue_handler)
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            if level_filter:
+                handler.addFilter(level_filter)
+            logger.addHandler(handler)
+
+    return logger
+
+
+def _file_handlers(log_dir: str, formatter: logging.Formatter) -> tuple:
+    """Rotating app and error log files for today."""
     # Create file handler with rotation (10MB max size, keep 5 backups)
     current_date = time.strftime("%Y-%m-%d")
     log_file = os.path.join(log_dir, f'app_{current_date}.log')
     file_handler = RotatingFileHandler(
-        log_file, 
+        log_file,
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
-    file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+
     # Create error log file for more severe issues
     error_log_file = os.path.join(log_dir, f'error_{current_date}.log')
     error_file_handler = RotatingFileHandler(
@@ -48,6 +207,9 @@ def setup_logger():
     )
     error_file_handler.setLevel(logging.ERROR)
     error_file_handler.setFormatter(formatter)
-    logger.addHandler(error_file_handler)
-    
-    return logger
+    return file_handler, error_file_handler
+
+
+# Flush queued records at exit; forked children start their own writer thread
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
@@ -0,0 +1,198 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Recent samples kept per metric for percentile estimates
+WINDOW_SIZE = 2048
+# Upper bounds (seconds) of the cumulative histogram buckets exported to Prometheus
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUANTILES = (0.50, 0.95, 0.99)
+
+
+class LatencyWindow:
+    """Count, total, bucket counts and a sliding window of recent samples for one metric."""
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self.samples = deque(maxlen=window_size)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        # One slot per bucket plus +Inf; counts are per bucket, not cumulative
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.bucket_counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float, ordered: list) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.50, ordered), 6),
+            "p95": round(self.quantile(0.95, ordered), 6),
+            "p99": round(self.quantile(0.99, ordered), 6),
+        }
+
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+# Stage -> seconds for the request being handled, when a trace is active
+_trace = contextvars.ContextVar("trace", default=None)
+
+
+def _window(name: str) -> LatencyWindow:
+    window = _metrics.get(name)
+    if window is None:
+        window = _metrics[name] = LatencyWindow()
+    return window
+
+
+def observe(name: str, seconds: float):
+    with _metrics_lock:
+        _window(name).observe(seconds)
+    trace = _trace.get()
+    if trace is not None:
+        trace[name] = trace.get(name, 0.0) + seconds
+
+
+def record_error(name: str):
+    with _metrics_lock:
+        _window(name).errors += 1
+
+
+@contextmanager
+def timed(name: str):
+    """Observe the block's duration as stage ``name``; an escaping exception also counts as an error."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_error(name)
+        raise
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def traced(name: str):
+    """Decorator form of timed() for service functions."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_iter(name: str, iterable):
+    """Yield from iterable, observing the total time spent producing its items once it is exhausted.
+
+    For lazy pipelines (load -> chunk) whose work happens inside next().
+    """
+    iterator = iter(iterable)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    except Exception:
+        record_error(name)
+        raise
+    finally:
+        observe(name, elapsed)
+
+
+def start_trace():
+    """Collect the stages observed in this context (one request); returns a token for finish_trace()."""
+    return _trace.set({})
+
+
+def current_trace() -> dict:
+    """Stages observed so far in this context's trace; empty when none is active."""
+    return _trace.get() or {}
+
+
+def finish_trace(token) -> dict:
+    trace = _trace.get() or {}
+    _trace.reset(token)
+    return trace
+
+
+def server_timing(stages: dict) -> str:
+    """Server-Timing header value for a finished trace."""
+    return ", ".join(f"{name};dur={seconds * 1e3:.1f}" for name, seconds in stages.items())
+
+
+def get_summary(name: str) -> dict:
+    with _metrics_lock:
+        window = _metrics.get(name)
+        return window.summary() if window else LatencyWindow().summary()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4).
+
+    The histogram can be aggregated across workers; the quantile gauges are
+    this process's recent window only.
+    """
+    with _metrics_lock:
+        snapshot = {
+            name: (list(w.bucket_counts), w.total, w.count, w.errors, sorted(w.samples))
+            for name, w in _metrics.items()
+        }
+
+    lines = [
+        "# HELP app_stage_duration_seconds Time spent in each request stage.",
+        "# TYPE app_stage_duration_seconds histogram",
+    ]
+    for name, (bucket_counts, total, count, _, _) in sorted(snapshot.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + ("+Inf",), bucket_counts):
+            cumulative += bucket_count
+            lines.append(f"app_stage_duration_seconds_bucket{_labels(stage=name, le=bound)} {cumulative}")
+        lines.append(f"app_stage_duration_seconds_sum{_labels(stage=name)} {total:.6f}")
+        lines.append(f"app_stage_duration_seconds_count{_labels(stage=name)} {count}")
+
+    lines += [
+        f"# HELP app_stage_duration_quantile_seconds Quantiles of the last {WINDOW_SIZE} samples per stage.",
+        "# TYPE app_stage_duration_quantile_seconds gauge",
+    ]
+    window = LatencyWindow()
+    for name, (_, _, _, _, ordered) in sorted(snapshot.items()):
+        for q in QUANTILES:
+            value = window.quantile(q, ordered)
+            lines.append(f"app_stage_duration_quantile_seconds{_labels(stage=name, quantile=q)} {value:.6f}")
+
+    lines += [
+        "# HELP app_stage_errors_total Stage runs that raised, or requests answered with a 5xx status.",
+        "# TYPE app_stage_errors_total counter",
+    ]
+    for name, (_, _, _, errors, _) in sorted(snapshot.items()):
+        lines.append(f"app_stage_errors_total{_labels(stage=name)} {errors}")
+    return "\n".join(lines) + "\n"
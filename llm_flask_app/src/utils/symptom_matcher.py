@@ -0,0 +1,122 @@
+import re
+from collections import deque
+from src.utils.sym_disease import symptoms_dict, symptom_mapping
+
+_is_word_char = re.compile(r"\w").match
+
+
+class SymptomMatcher:
+    """Aho-Corasick automaton over every symptom pattern, built once at import.
+
+    A single left-to-right pass over the text reports every occurrence of every
+    pattern. Each pattern carries the roles it plays in the original
+    extraction rules:
+
+    * multi-word ``symptom_mapping`` keys and all ``symptoms_dict`` keys match
+      anywhere in the text (substring semantics);
+    * single-word ``symptom_mapping`` keys and ``symptoms_dict`` keys made only
+      of word characters match whole words only, like ``\\b\\w+\\b`` tokens.
+    """
+
+    def __init__(self, mapping, vocabulary):
+        self.mapping = mapping
+        self.vocabulary = vocabulary
+        self.phrase_order = {}
+        self.vocabulary_order = {}
+        self.word_targets = {}
+
+        for position, key in enumerate(k for k in mapping if " " in k):
+            self.phrase_order[key] = position
+        for position, symptom in enumerate(vocabulary):
+            self.vocabulary_order[symptom] = position
+        for key, target in mapping.items():
+            if self._is_word(key):
+                self.word_targets[key] = target
+        for symptom in vocabulary:
+            if self._is_word(symptom) and symptom not in self.word_targets:
+                self.word_targets[symptom] = symptom
+
+        patterns = set(self.phrase_order) | set(self.vocabulary_order) | set(self.word_targets)
+        self._build(patterns)
+
+    @staticmethod
+    def _is_word(pattern):
+        return bool(pattern) and all(_is_word_char(ch) for ch in pattern)
+
+    def _build(self, patterns):
+        goto = [{}]
+        outputs = [()]
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(())
+                state = nxt
+            outputs[state] = outputs[state] + (pattern,)
+
+        # Breadth-first pass that turns the trie into a complete transition table,
+        # so matching never has to walk failure links at runtime.
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                transitions[ch] = nxt
+                queue.append(nxt)
+            delta[state] = transitions
+            outputs[state] = outputs[state] + outputs[fail[state]]
+
+        self._delta = delta
+        self._outputs = outputs
+
+    def find_all(self, text):
+        """Yield (start, end, pattern) for every pattern occurrence in text."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for end, ch in enumerate(text, 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for pattern in outputs[state]:
+                    yield end - len(pattern), end, pattern
+
+    def extract(self, text):
+        """Return symptoms in the same order the original three-phase scan produced them."""
+        text = text.lower()
+        length = len(text)
+        phrases, words, direct = [], [], []
+        for start, end, pattern in self.find_all(text):
+            if pattern in self.phrase_order:
+                phrases.append(pattern)
+            if pattern in self.vocabulary_order:
+                direct.append(pattern)
+            if pattern in self.word_targets:
+                if (start == 0 or not _is_word_char(text[start - 1])) and (
+                    end == length or not _is_word_char(text[end])
+                ):
+                    words.append((start, pattern))
+
+        extracted, seen = [], set()
+
+        def add(symptom):
+            if symptom in self.vocabulary and symptom not in seen:
+                seen.add(symptom)
+                extracted.append(symptom)
+
+        for pattern in sorted(set(phrases), key=self.phrase_order.__getitem__):
+            add(self.mapping[pattern])
+        for _, pattern in sorted(words):
+            add(self.word_targets[pattern])
+        for pattern in sorted(set(direct), key=self.vocabulary_order.__getitem__):
+            add(pattern)
+        return extracted
+
+
+symptom_matcher = SymptomMatcher(symptom_mapping, symptoms_dict)
@@ -0,0 +1,146 @@
+import csv
+import os
+import re
+import threading
+from contextlib import contextmanager
+import numpy as np
+from src.utils.sym_disease import symptoms_dict
+
+TRAINING_CSV = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../trainingdata/Training.csv'))
+
+# Largest batch encoded into the per-thread buffer; bigger ones get a one-off matrix
+BUFFER_MAX_ROWS = 64
+# Above this many ones, one numpy fancy-index store is cheaper than a Python loop
+FANCY_INDEX_MIN_CELLS = 32
+
+_separators = re.compile(r"[\s_\-]+")
+
+
+def normalize_symptom(name: str) -> str:
+    """Lowercase and collapse runs of spaces, underscores and hyphens into one '_'."""
+    return _separators.sub("_", name.strip().lower()).strip("_")
+
+
+def _training_columns(path: str) -> list:
+    """Symptom column names from the header of Training.csv, in model feature order.
+
+    Repeated names get a ".1", ".2", ... suffix, as pandas gives them when the
+    model is trained (fluid_overload appears twice).
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+    columns, seen = [], {}
+    for name in header:
+        if name == "prognosis":
+            continue
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        columns.append(f"{name}.{count}" if count else name)
+    return columns
+
+
+class SymptomVocabulary:
+    """Model feature column for every accepted spelling of a symptom, built once at import.
+
+    Canonical names are the ``symptoms_dict`` keys, which must match the
+    Training.csv header the SVC was fitted on. Every name is also registered
+    under its normalized form, so ``" skin_rash"`` (as written in
+    symtoms_df.csv), ``"Skin Rash"`` and ``"spotting urination"`` resolve to
+    the same columns as ``"skin_rash"`` and ``"spotting_ urination"``.
+    """
+
+    def __init__(self, columns: dict, training_columns=None):
+        self.columns = dict(columns)
+        self.size = len(self.columns)
+        self.names = [None] * self.size
+        for name, index in self.columns.items():
+            self.names[index] = name
+        if training_columns is not None and list(training_columns) != self.names:
+            raise ValueError("Training.csv symptom columns do not match symptoms_dict")
+
+        self._aliases = {}
+        for name, index in self.columns.items():
+            alias = normalize_symptom(name)
+            if self._aliases.get(alias, index) != index:
+                raise ValueError(f"Symptoms {self.names[self._aliases[alias]]!r} and {name!r} normalize to {alias!r}")
+            self._aliases[alias] = index
+        self._local = threading.local()
+
+    def lookup(self, name) -> int | None:
+        """Column of a symptom name or alias, or None if it is unknown."""
+        index = self.columns.get(name)
+        if index is None and isinstance(name, str):
+            index = self._aliases.get(normalize_symptom(name))
+        return index
+
+    def resolve(self, symptoms) -> tuple:
+        """Return (canonical names in input order without duplicates, inputs that matched nothing)."""
+        names, unmapped, seen = [], [], set()
+        for item in symptoms:
+            index = self.lookup(item)
+            if index is None:
+                unmapped.append(item)
+            elif index not in seen:
+                seen.add(index)
+                names.append(self.names[index])
+        return names, unmapped
+
+    def indices(self, symptoms) -> list:
+        """Columns of the known symptoms; unknown ones are skipped."""
+        return [index for index in map(self.lookup, symptoms) if index is not None]
+
+    def bitset(self, symptoms) -> int:
+        """The symptom set as an int with one bit per column: compact, hashable, order-free."""
+        bits = 0
+        for index in self.indices(symptoms):
+            bits |= 1 << index
+        return bits
+
+    @contextmanager
+    def encoded(self, patients_symptoms):
+        """Yield a one-hot (n_patients, size) float64 matrix backed by this thread's reusable buffer.
+
+        SVC.predict validates its input to C-ordered float64, so a view of a
+        buffer already in that layout is used without a copy. The rows are
+        zeroed again on exit; the matrix must not be used after the with block.
+        Batches over BUFFER_MAX_ROWS get a fresh matrix, so no thread keeps a
+        large buffer alive.
+        """
+        count = len(patients_symptoms)
+        reused = count <= BUFFER_MAX_ROWS
+        if not reused:
+            buffer = np.zeros((count, self.size))
+        else:
+            buffer = getattr(self._local, "buffer", None)
+            if buffer is None:
+                buffer = self._local.buffer = np.zeros((BUFFER_MAX_ROWS, self.size))
+        cells = buffer.reshape(-1)
+        columns = self.columns
+        positions = []
+        offset = 0
+        for symptoms in patients_symptoms:
+            for item in symptoms:
+                # Names from resolve() are canonical; only raw input needs the alias lookup
+                index = columns.get(item)
+                if index is None:
+                    index = self.lookup(item)
+                if index is not None:
+                    positions.append(offset + index)
+            offset += self.size
+        if len(positions) > FANCY_INDEX_MIN_CELLS:
+            cells[positions] = 1.0
+        else:
+            # Scalar stores beat fancy indexing for the handful of ones in a single request
+            for position in positions:
+                cells[position] = 1.0
+        matrix = buffer[:count]
+        try:
+            yield matrix
+        finally:
+            if reused:
+                matrix.fill(0.0)
+
+
+symptom_vocabulary = SymptomVocabulary(
+    symptoms_dict, _training_columns(TRAINING_CSV) if os.path.exists(TRAINING_CSV) else None
+)
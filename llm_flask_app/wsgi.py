@@ -0,0 +1,11 @@
+"""WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+create_app() loads the SVC model and knowledge-base tables; with
+preload_app (see gunicorn.conf.py) that happens once in the master and
+workers share the pages copy-on-write.
+"""
+from app import create_app
+
+app = create_app()